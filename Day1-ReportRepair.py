@@ -1,8 +1,192 @@
+from collections import Counter
+from math import prod
+from typing import Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError: # queries fall back to scanning the sorted values
+    np = None
+
+
+def find_k_sums(elements : list[int], k : int, target : int = 2020) -> list[tuple]:
+    """Find every set of k entries summing to target. Each solution is a
+    sorted tuple of values, listed once however many entries share them."""
+    if k < 1:
+        raise ValueError(f"Can't sum {k} entries")
+
+    counts = Counter(elements)
+    if not counts:
+        return []
+    if k == 1:
+        return [(target,)] if target in counts else []
+    if k == 2:
+        return sorted(
+            (x, target - x) for x in counts
+            if x < target - x and target - x in counts
+            or x == target - x and counts[x] >= 2
+        )
+
+    # Work on the distinct values only, so repeated entries cost nothing
+    values = sorted(counts)
+    return list(_sorted_k_sums(values, counts, k, target, 0, ()))
+
+def _sorted_k_sums(
+    values : list[int], counts : Counter, k : int, target : int,
+    start : int, chosen : tuple
+) -> Iterator[tuple]:
+    def available(x : int) -> int:
+        return counts[x] - chosen.count(x)
+
+    if k == 2:
+        j, l = start, len(values) - 1 # left and right iterators
+        while j <= l:
+            x, y = values[j], values[l]
+            if x + y < target:
+                j += 1
+            elif x + y > target:
+                l -= 1
+            else:
+                if (j < l and available(x) and available(y)) or available(x) >= 2:
+                    yield chosen + (x, y)
+                j += 1
+                l -= 1
+        return
+
+    largest = values[-1]
+    for i in range(start, len(values)):
+        x = values[i]
+        if x * k > target:
+            break # everything from here on is too big
+        if x + largest * (k - 1) < target or not available(x):
+            continue
+        # i, not i + 1, so a value can be reused while entries remain
+        yield from _sorted_k_sums(values, counts, k - 1, target - x, i, chosen + (x,))
+
+class SumIndex:
+    """An expense report prepared for answering many sum queries at once.
+
+    Queries take a batch of targets and give one solution (a sorted tuple
+    of values) or None for each. With NumPy, pair queries search the sorted
+    values for every complement in the batch at once, and triple queries
+    search a table of the sums of every two values, built on the first
+    triple query. The table has d(d+1)/2 entries for d distinct values, so
+    above PAIR_TABLE_LIMIT (or without NumPy) the values are scanned
+    instead, one target at a time.
+    """
+    PAIR_TABLE_LIMIT = 20_000_000
+    BLOCK = 1 << 20 # complements searched at once
+
+    def __init__(self, elements : Iterable[int]):
+        self.counts = Counter(elements)
+        self.values = sorted(self.counts)
+        self.pair_table = None
+
+        if np is not None:
+            self.array = np.array(self.values, dtype=np.int64)
+            self.count_array = np.array([self.counts[x] for x in self.values], dtype=np.int64)
+
+    def _blocks(self, targets : list[int]):
+        """Split targets into arrays small enough to search together."""
+        size = max(1, self.BLOCK // max(1, len(self.values)))
+        for i in range(0, len(targets), size):
+            yield np.array(targets[i:i + size], dtype=np.int64)
+
+    def _scan(self, k : int, target : int) -> tuple:
+        if not self.values:
+            return None
+        return next(_sorted_k_sums(self.values, self.counts, k, target, 0, ()), None)
+
+    def pairs(self, targets : Iterable[int]) -> list[tuple]:
+        """Find two entries summing to each target."""
+        targets = list(targets)
+        if np is None or not self.values:
+            return [self._scan(2, t) for t in targets]
+
+        values, counts = self.array, self.count_array
+        results = []
+        for block in self._blocks(targets):
+            complements = block[:, None] - values
+            pos = np.minimum(np.searchsorted(values, complements), len(values) - 1)
+            found = values[pos] == complements
+            # find each pair from its smaller value
+            found &= (complements > values) | ((complements == values) & (counts >= 2))
+
+            hit = found.any(axis=1)
+            first = found.argmax(axis=1)
+            for target, ok, i in zip(block.tolist(), hit, first.tolist()):
+                results.append((self.values[i], target - self.values[i]) if ok else None)
+        return results
+
+    def _build_pair_table(self):
+        """Get every distinct sum of two entries, sorted, with the indices
+        of the values in one pair giving it and whether others do too."""
+        values, counts = self.array, self.count_array
+        i, j = np.triu_indices(len(values))
+        usable = (i != j) | (counts[i] >= 2)
+        i, j = i[usable], j[usable]
+
+        pair_sums = values[i] + values[j]
+        order = np.argsort(pair_sums, kind="stable")
+        sums, starts, sizes = np.unique(
+            pair_sums[order], return_index=True, return_counts=True
+        )
+        return sums, i[order][starts], j[order][starts], sizes > 1
+
+    def triples(self, targets : Iterable[int]) -> list[tuple]:
+        """Find three entries summing to each target."""
+        targets = list(targets)
+        d = len(self.values)
+        if np is None or not d or d * (d + 1) // 2 > self.PAIR_TABLE_LIMIT:
+            return [self._scan(3, t) for t in targets]
+
+        if self.pair_table is None:
+            self.pair_table = self._build_pair_table()
+        sums, firsts, seconds, shared = self.pair_table
+        if not len(sums):
+            return [None] * len(targets)
+
+        counts = self.count_array
+        indices = np.arange(d)
+        results = []
+        for block in self._blocks(targets):
+            complements = block[:, None] - self.array
+            pos = np.minimum(np.searchsorted(sums, complements), len(sums) - 1)
+            found = sums[pos] == complements
+            # The stored pair may use the same value as the first entry, so
+            # check there are enough entries to go round. Only one pair of
+            # values with a given sum can include that value, so when other
+            # pairs share the sum one of them always works.
+            needed = 1 + (firsts[pos] == indices) + (seconds[pos] == indices)
+            found &= shared[pos] | (counts >= needed)
+
+            hit = found.any(axis=1)
+            first = found.argmax(axis=1)
+            for target, ok, i in zip(block.tolist(), hit, first.tolist()):
+                results.append(self._triple(target, i) if ok else None)
+        return results
+
+    def _triple(self, target : int, i : int) -> tuple:
+        """Complete a triple known to exist from the value at index i."""
+        x = self.values[i]
+        self.counts[x] -= 1
+        try:
+            rest = self._scan(2, target - x)
+        finally:
+            self.counts[x] += 1
+        return tuple(sorted((x,) + rest))
+
+def get_2020_product(elements : list[int], k : int) -> int:
+    solutions = find_k_sums(elements, k)
+    if not solutions:
+        raise ValueError(f"No {k} entries sum to 2020")
+    return prod(solutions[0])
+
 def get_summing_pair(target : int, elements : list[int]) -> int:
-    check = set(elements)
+    seen = set()
     for x in elements:
-        if target - x in elements:
+        if target - x in seen:
             return x
+        seen.add(x)
 
 def get_2020_2(elements : list[int]) -> int:
     x = get_summing_pair(2020, elements)
@@ -27,7 +211,7 @@ def get_2020_3(elements : list[int]) -> int:
             if p_sum == new_target:
                 print(f"Found: {first}, {elements[j]}, {elements[k]}.")
                 return first * elements[j] * elements[k]
-            elif p_sum < target:
+            elif p_sum < new_target:
                 j += 1 # advance left iterator to increase value
             else:
                 k -= 1 # advance right iterator to decrease value
@@ -48,8 +232,16 @@ def get_2020_3a(elements : list[int]) -> int:
                     print(a, b, c)
                     return a * b * c
 
+def read_entries(path : str) -> list[int]:
+    with open(path, "r") as f:
+        return [int(l) for l in f.readlines()]
+
+def solve_part1(path : str) -> int:
+    return get_2020_product(read_entries(path), 2)
+
+def solve_part2(path : str) -> int:
+    return get_2020_product(read_entries(path), 3)
+
 if __name__ == "__main__":
-    with open("input1.txt", "r") as f:
-        entries = [int(l) for l in f.readlines()]
-        print(sorted(entries))
-        print(get_2020_3a(entries))
+    print("Pair product:", solve_part1("input1.txt"))
+    print("Triple product:", solve_part2("input1.txt"))
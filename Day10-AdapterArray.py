@@ -1,4 +1,5 @@
-from collections import Counter
+from collections import Counter, deque
+from typing import Iterable
 
 def diff_counts(values : list[int]) -> dict[int, int]:
     """Count the gaps between ordered elements in a list, by size."""
@@ -6,28 +7,55 @@ def diff_counts(values : list[int]) -> dict[int, int]:
 
     return Counter(j - i for i, j in zip(ordered, ordered[1:]))
 
-def count_orders(values : list[int], max_diff : int) -> int:
+def count_orders(values : list[int], max_diff : int, modulus : int = None) -> int:
     """Count the valid progressions through the values with a maximum jump size."""
-    ordered = [0] + sorted(values) + [max(values) + 3]
-    options = [0] * len(ordered)
-    options[0] = 1
+    return count_orders_sorted(sorted(values), max_diff, modulus)
+
+def count_orders_sorted(
+    values : Iterable[int], max_diff : int, modulus : int = None
+) -> int:
+    """Count the valid progressions through a stream of values in ascending
+    order, keeping only the values within max_diff of the latest. With a
+    modulus, the count is kept modulo it so it stays small."""
+    # (value, ways of reaching it) for the values still in reach, and the
+    # total of those ways: the ways of reaching the next value
+    window = deque([(0, 1)])
+    reachable = 1
+    last = None
+
+    def add(val : int):
+        nonlocal reachable
+        while window and val - window[0][0] > max_diff:
+            reachable -= window.popleft()[1] # difference too large
+        ways = reachable
+        if modulus:
+            ways %= modulus
+        window.append((val, ways))
+        reachable += ways
+
+    for val in values:
+        if last is not None and val < last:
+            raise ValueError("Values must be in ascending order")
+        add(val)
+        last = val
+
+    if last is None:
+        raise ValueError("No adapters")
+    add(last + 3) # the device
+    return window[-1][1]
+
+def read_values(path : str) -> list[int]:
+    with open(path) as f:
+        return [*map(int, f.readlines())]
+
+def solve_part1(path : str) -> int:
+    diffs = diff_counts(read_values(path))
+    return diffs[1] * diffs[3]
 
-    # Each element of options should be the sum of all prior elements
-    # where the difference between the matching values in ordered is less than
-    # max_diff
-    for i, val in enumerate(ordered[1:], 1):
-        for j in range(i-1, -1, -1):
-            if val - ordered[j] > max_diff:
-                break # difference too large
-            options[i] += options[j]
-    
-    return options[-1]
+def solve_part2(path : str) -> int:
+    return count_orders(read_values(path), 3)
 
 
 if __name__ == "__main__":
-    with open("input10.txt") as f:
-        values = [*map(int, f.readlines())]
-    
-    diffs = diff_counts(values)
-    print("Diffs in chain:", diffs, diffs[1] * diffs[3])
-    print("Options for chain:", count_orders(values, 3))
+    print("Diffs in chain:", solve_part1("input10.txt"))
+    print("Options for chain:", solve_part2("input10.txt"))
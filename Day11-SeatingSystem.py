@@ -112,18 +112,24 @@ def make_step(adj_list):
     return step_sight
     
 
-if __name__ == "__main__":
-    with open("input11.txt") as f:
-        board = make_board(f.readlines())
+def read_board(path : str) -> list[list[Union[bool, None]]]:
+    with open(path) as f:
+        return make_board(f.readlines())
+
+def solve_part1(path : str) -> int:
+    static = iterate_to_halt(read_board(path), step)
+    return sum(sum(map(bool, line)) for line in static)
+
+def solve_part2(path : str) -> int:
+    board = read_board(path)
+    step_func = make_step(adj_list(board))
+    static = iterate_to_halt(board, step_func)
+    return sum(sum(map(bool, line)) for line in static)
 
+
+if __name__ == "__main__":
     print("Iterating to no change...")
-    static = iterate_to_halt(board, step)
-    seats = sum(sum(map(bool, line)) for line in static)
-    print("Seats occupied:", seats)
+    print("Seats occupied:", solve_part1("input11.txt"))
 
-    seats_seen = adj_list(board)
-    step_func = make_step(seats_seen)
     print("Iterating to no change...")
-    static = iterate_to_halt(board, step_func)
-    seats = sum(sum(map(bool, line)) for line in static)
-    print("Seats occupied:", seats)
+    print("Seats occupied:", solve_part2("input11.txt"))
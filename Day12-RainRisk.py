@@ -74,15 +74,24 @@ class WaypointShip(Ship):
         #print(f"{instr}: {old} -> ({self.x}, {self.y}, {self.dx}, {self.dy})")
     
 
-if __name__ == "__main__":
-    ship = Ship()
-    wp_ship = WaypointShip()
-    with open("input12.txt") as f:
+def sail(path:str, ship:Ship) -> Ship:
+    """Move a ship through every instruction in a file."""
+    with open(path) as f:
         for line in f.readlines():
-            instr = line.strip()
-            ship.move(instr)
-            wp_ship.move(instr)
-    
+            ship.move(line.strip())
+    return ship
+
+def solve_part1(path:str) -> int:
+    return sail(path, Ship()).norm
+
+def solve_part2(path:str) -> int:
+    return sail(path, WaypointShip()).norm
+
+
+if __name__ == "__main__":
+    ship = sail("input12.txt", Ship())
+    wp_ship = sail("input12.txt", WaypointShip())
+
     print("Final position of ship:", ship.x, ship.y)
     print("Manhattan distance to origin:", ship.norm)
     
@@ -57,13 +57,19 @@ def part2(busses : list[str]) -> int:
     return start1
 
 
-if __name__ == "__main__":
-    with open("input13.txt") as f:
+def read_notes(path:str) -> tuple[int, list[str]]:
+    with open(path) as f:
         now = int(f.readline())
         busses = f.readline().strip().split(',')
-    
-    print(now)
-    print(busses)
+    return now, busses
+
+def solve_part1(path:str) -> int:
+    return part1(*read_notes(path))
 
-    print(f"Earliest departure score: {part1(now, busses)}")
-    print(f"Earliest time: {part2(busses)}")
+def solve_part2(path:str) -> int:
+    return part2(read_notes(path)[1])
+
+
+if __name__ == "__main__":
+    print(f"Earliest departure score: {solve_part1('input13.txt')}")
+    print(f"Earliest time: {solve_part2('input13.txt')}")
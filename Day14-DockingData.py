@@ -78,9 +78,14 @@ def execute(instructions : list[str], mem : Memory) -> int:
     # mem.print()
     return sum(mem.state.values())
 
+def solve_part1(path:str) -> int:
+    with open(path) as f:
+        return execute(f.readlines(), Memory())
+
+def solve_part2(path:str) -> int:
+    with open(path) as f:
+        return execute(f.readlines(), AddressMaskMemory())
+
 if __name__ == "__main__":
-    with open("input14.txt") as f:
-        lines = f.readlines()
-    
-    print(f"Sum of all values in storage: {execute(lines, Memory())}")
-    print(f"With address masking: {execute(lines, AddressMaskMemory())}")
+    print(f"Sum of all values in storage: {solve_part1('input14.txt')}")
+    print(f"With address masking: {solve_part2('input14.txt')}")
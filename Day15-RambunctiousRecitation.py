@@ -1,6 +1,8 @@
 from collections import defaultdict
 from time import time
 
+from aoc2020 import metrics
+
 class SequenceMaker:
     def __init__(self, input:list[int]):
         self.last_seen = defaultdict(int)
@@ -21,19 +23,28 @@ class SequenceMaker:
 
     def get_turn(self, turn:int) -> int:
         """Get the value played on a given turn"""
+        start = self.turns_played
         
         while self.turns_played < turn - 1:
             self.next_play = self.play_turn(self.next_play)
         
+        metrics.add("turns played", self.turns_played - start)
         return self.next_play
 
 
-if __name__ == "__main__":
-    with open("input15.txt") as f:
-        start_vals = list(map(int, f.read().strip().split(",")))
+def read_start(path:str) -> list[int]:
+    with open(path) as f:
+        return list(map(int, f.read().strip().split(",")))
+
+def solve_part1(path:str) -> int:
+    return SequenceMaker(read_start(path)).get_turn(2020)
 
-    seq = SequenceMaker(start_vals)
+def solve_part2(path:str) -> int:
+    return SequenceMaker(read_start(path)).get_turn(30000000)
+
+
+if __name__ == "__main__":
     start = time()
-    print(f"Turn 2020: {seq.get_turn(2020)} (took {time() - start})")
+    print(f"Turn 2020: {solve_part1('input15.txt')} (took {time() - start})")
     start = time()
-    print(f"Turn 30mil: {seq.get_turn(30000000)}. (took {time() - start})")
+    print(f"Turn 30mil: {solve_part2('input15.txt')}. (took {time() - start})")
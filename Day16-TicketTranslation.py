@@ -1,3 +1,7 @@
+from itertools import islice
+
+from aoc2020.records import read_record_lines
+
 def parse_rules(rules_string : str) -> dict[str, set[int]]:
     rules = {}
     for line in rules_string.strip().split("\n"):
@@ -65,29 +69,33 @@ def determine_rules(tickets, rules):
     return known_positions
 
 
-if __name__ == "__main__":
-    with open("input16.txt") as f:
-        sections = f.read().split("\n\n")
-    
-    rules = parse_rules(sections[0])
-    our_ticket = parse_ticket(sections[1].split("\n")[1])
-    tickets = [
-        parse_ticket(line)
-        for line in sections[2].strip().split("\n")[1:]
-    ]
+def read_notes(path : str):
+    """Get the rules, our ticket and the nearby tickets from a file.
+    The nearby tickets are parsed as they are iterated over."""
+    sections = read_record_lines(path)
 
-    print(len(rules), "rules parsed.")
-    print(len(tickets), "tickets read")
+    rules = parse_rules("\n".join(next(sections)))
+    our_ticket = parse_ticket(list(next(sections))[1])
+    tickets = map(parse_ticket, islice(next(sections), 1, None))
+    return rules, our_ticket, tickets
 
-    print("Total of invalid fields for all rules: ", sum(completely_invalid(tickets, rules)))
+def solve_part1(path : str) -> int:
+    rules, _, tickets = read_notes(path)
+    return sum(completely_invalid(tickets, rules))
 
+def solve_part2(path : str) -> int:
+    rules, our_ticket, tickets = read_notes(path)
     tickets = list(valid_tickets(tickets, rules))
-    print(len(tickets), "tickets remaining.")
 
     rule_locations = determine_rules(tickets, rules)
     total = 1
     for rule, pos in rule_locations.items():
         if rule.startswith("departure"):
             total *= our_ticket[pos]
-    
-    print(total)
+
+    return total
+
+
+if __name__ == "__main__":
+    print("Total of invalid fields for all rules: ", solve_part1("input16.txt"))
+    print(solve_part2("input16.txt"))
@@ -57,16 +57,21 @@ class ConwayCubes4:
             if counts[pos] == 3 or (counts[pos] == 2 and pos in self.active)
         }
 
-if __name__ == "__main__":
-    with open("input17.txt") as f:
-        lines = f.readlines()
+def run_cubes(path, cube_type, steps=6) -> int:
+    """Count the active cubes after a number of steps from a seed file."""
+    with open(path) as f:
+        cubes = cube_type(f.readlines())
 
-    cubes = ConwayCubes(lines)
-    for _ in range(6):
+    for _ in range(steps):
         cubes.step()
-    print(len(cubes.active))
+    return len(cubes.active)
+
+def solve_part1(path) -> int:
+    return run_cubes(path, ConwayCubes)
 
-    hycubes = ConwayCubes4(lines)
-    for _ in range(6):
-        hycubes.step()
-    print(len(hycubes.active))
+def solve_part2(path) -> int:
+    return run_cubes(path, ConwayCubes4)
+
+if __name__ == "__main__":
+    print(solve_part1("input17.txt"))
+    print(solve_part2("input17.txt"))
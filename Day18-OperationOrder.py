@@ -66,9 +66,14 @@ def evaluate2(tokens) -> int:
 
     return working[0]
 
-if __name__ == '__main__':
-    with open('input18.txt') as f:
-        expressions = f.readlines()
+def solve_part1(path:str) -> int:
+    with open(path) as f:
+        return sum(evaluate(parse(ex)) for ex in f.readlines())
+
+def solve_part2(path:str) -> int:
+    with open(path) as f:
+        return sum(evaluate2(parse(ex)) for ex in f.readlines())
 
-    print(sum(evaluate(parse(ex)) for ex in expressions))
-    print(sum(evaluate2(parse(ex)) for ex in expressions))
+if __name__ == '__main__':
+    print(solve_part1('input18.txt'))
+    print(solve_part2('input18.txt'))
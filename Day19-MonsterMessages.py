@@ -1,5 +1,8 @@
 from time import time
 
+from aoc2020 import metrics
+from aoc2020.records import read_record_lines
+
 to_ints = lambda s: map(int, s.split())
 
 def parse_rules(ruletext:str):
@@ -30,13 +33,17 @@ def is_match(line, rules, target=0):
     # Each entry is a list of rules to match (in sequence) and the position
     # in the line that the first of these rules must match against.
     options = [([target], 0)]
+    counting, pops = metrics.enabled, 0
     while options:
         to_match, pos = options.pop()
+        if counting:
+            pops += 1
 
         # If we are at the end of the option, check that the entire
         # line has been consumed - if not, the option doesn't work
         if len(to_match) == 0:
             if pos == len(line):
+                metrics.add("stack pops", pops)
                 return True
             continue
 
@@ -63,17 +70,20 @@ def is_match(line, rules, target=0):
                 options.append((sub_rule + to_match[1:], pos))
     
     # There are no more possibilities
+    metrics.add("stack pops", pops)
     return False   
             
 
 
-if __name__ == '__main__':
-    with open('input19.txt') as f:
-        rule_block, message_block = f.read().split("\n\n")
+def solve_part1(path:str) -> int:
+    blocks = read_record_lines(path)
+    rules = parse_rules("\n".join(next(blocks)))
+    messages = next(blocks)
 
-    start = time()
-    rules = parse_rules(rule_block)
-    messages = message_block.strip().split("\n")
+    return sum((is_match(m, rules) for m in messages))
 
-    print("Matching messages:", sum((is_match(m, rules) for m in messages)))
+
+if __name__ == '__main__':
+    start = time()
+    print("Matching messages:", solve_part1('input19.txt'))
     print("Took", time() - start)
@@ -1,13 +1,16 @@
+import locale
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+POLICY = re.compile(r"(\d+)-(\d+) (.): (.*)")
+POLICIES = re.compile(r"^(\d+)-(\d+) (.): (.*)$", re.MULTILINE)
+CHUNK_SIZE = 1 << 22 # bytes read at a time when streaming
 
 def get_policy(line : str) -> tuple[int, int, str, str]:
-    match = re.match(r"(\d+)-(\d+) (.): (.*)", line)
-    return (
-        int(match.groups()[0]),
-        int(match.groups()[1]),
-        match.groups()[2],
-        match.groups()[3]
-    )
+    low, high, char, password = POLICY.match(line).groups()
+    return int(low), int(high), char, password
 
 def count_valid(lines : list[str]) -> int:
     count = 0
@@ -31,10 +34,90 @@ def count_valid_2(lines : list[str]) -> int:
     
     return count
 
+def count_chunk(text : str) -> tuple[int, int]:
+    """Count the lines of a chunk valid under each policy, as count_valid
+    and count_valid_2 would."""
+    policies = POLICIES.findall(text)
+    lines = text.count("\n") + (not text.endswith("\n"))
+    if len(policies) != lines:
+        raise ValueError("Chunk contains a line that isn't a password policy")
+
+    count, count_2 = 0, 0
+    for low, high, char, password in policies:
+        low, high = int(low), int(high)
+        count += low <= password.count(char) <= high
+        count_2 += (
+            (low <= len(password) and password[low-1] == char) !=
+            (high <= len(password) and password[high-1] == char)
+        )
+    return count, count_2
+
+def read_chunks(
+    path : str, start : int = 0, end : int = None, size : int = CHUNK_SIZE
+) -> Iterator[str]:
+    """Read the lines between two byte offsets as text, in chunks of about
+    size bytes ending at line breaks. start must be the start of a line."""
+    encoding = locale.getpreferredencoding(False) # as open(path, "r") uses
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = (os.fstat(f.fileno()).st_size if end is None else end) - start
+        tail = b""
+        while remaining > 0:
+            block = f.read(min(size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            block = tail + block
+            cut = block.rfind(b"\n") + 1 if remaining > 0 else len(block)
+            tail = block[cut:]
+            if cut:
+                # universal newlines, as in text mode
+                yield block[:cut].decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+        if tail:
+            yield tail.decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+
+def _count_range(path : str, start : int, end : int) -> tuple[int, int]:
+    count, count_2 = 0, 0
+    for chunk in read_chunks(path, start, end):
+        a, b = count_chunk(chunk)
+        count += a
+        count_2 += b
+    return count, count_2
+
+def line_ranges(path : str, parts : int) -> list[tuple[int, int]]:
+    """Split a file into about equal byte ranges that start at line starts."""
+    size = os.path.getsize(path)
+    starts = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, starts[-1]))
+            f.readline() # move on to the start of the next line
+            if f.tell() >= size:
+                break
+            starts.append(f.tell())
+    return list(zip(starts, starts[1:] + [size]))
+
+def count_both(path : str, jobs : int = 1) -> tuple[int, int]:
+    """Count the passwords valid under each policy in one pass over the
+    file. With more than one job, ranges of the file are counted in
+    separate processes (0: one per CPU)."""
+    if jobs == 1:
+        return _count_range(path, 0, None)
+
+    ranges = line_ranges(path, jobs or os.cpu_count())
+    with ProcessPoolExecutor(jobs or None) as pool:
+        starts, ends = zip(*ranges)
+        results = list(pool.map(_count_range, [path] * len(ranges), starts, ends))
+    return tuple(map(sum, zip(*results)))
+
+
+def solve_part1(path : str, jobs : int = 1) -> int:
+    return count_both(path, jobs)[0]
+
+def solve_part2(path : str, jobs : int = 1) -> int:
+    return count_both(path, jobs)[1]
+
 
 if __name__ == "__main__":
-    with open("input2.txt", "r") as f:
-        lines = f.readlines()
-    
-    print(f"Valid passwords (low-high): {count_valid(lines)}")
-    print(f"Valid passwords (position): {count_valid_2(lines)}")
+    print(f"Valid passwords (low-high): {solve_part1('input2.txt')}")
+    print(f"Valid passwords (position): {solve_part2('input2.txt')}")
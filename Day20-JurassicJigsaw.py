@@ -1,6 +1,10 @@
 from functools import lru_cache
 from math import sqrt
 from time import time
+from typing import Iterable
+
+from aoc2020 import metrics
+from aoc2020.records import read_text_records
 
 @lru_cache()
 def line_value(line):
@@ -92,6 +96,9 @@ class Grid:
 
         self.active_tile = 0 # The lowest numbered tile yet to be filled
 
+        self.counting = metrics.enabled # Whether to count placements
+        self.placements = 0 # Number of times a tile has been tried in a slot
+
     def arrange(self):
         """Try to slot a tile into the first currently empty slot
         For each valid tile call arrange recursively.
@@ -114,6 +121,8 @@ class Grid:
                 for tx in Tile.Transformations[:4]: # no reflections for first tile
                     self.grid[0][0] = tile.transform(*tx)
                     self.tx_grid[0][0] = tx
+                    if self.counting:
+                        self.placements += 1
                     # print(f"Tile {tile.id} placed in slot {i},{j}. {tx}")
                     if self.arrange(): return True
                 self.used.remove(tile.id) # wasn't the right one
@@ -157,6 +166,8 @@ class Grid:
                     self.tx_grid[i][j] = tx
                     self.active_tile += 1
                     self.used.add(tile.id)
+                    if self.counting:
+                        self.placements += 1
                     # print(f"Tile {tile.id} placed in slot {i},{j}. {tx}")
                     if self.arrange():
                         return True
@@ -310,29 +321,41 @@ class Image:
         print(f"Found {found} monsters in total, occupying {len(monster_tiles)} tiles.")
         choppy_tiles = sum(map(sum, self.contents)) - len(monster_tiles)
         print(f"There are {choppy_tiles} choppy tiles remaining.")
-        
-if __name__ == '__main__':
-    with open('input20.txt') as f:
-        tile_chunks = f.read().split("\n\n")
-    
-    start = time()
-    tiles = [Tile(chunk) for chunk in tile_chunks]
-    grid = Grid(tiles)
-    grid.arrange()
-    grid.print()
-    print("Product of corners: ", grid.value, "\n")
-    print("Part 1 took", time() - start)
+        return choppy_tiles
+
+SEA_MONSTER = [
+    "                  # ",
+    "#    ##    ##    ###",
+    " #  #  #  #  #  #   ",
+]
+
+def solve_grid(tile_chunks:Iterable[str]) -> Grid:
+    """Arrange the tiles described by the chunks into a grid."""
+    grid = Grid([Tile(chunk) for chunk in tile_chunks])
+    arranged = grid.arrange()
+    # Every placement is undone except, on success, one per tile
+    metrics.add("tiles placed", grid.placements)
+    metrics.add("backtracks", grid.placements - arranged * len(grid.tileset))
+    return grid
+
+def solve_part1(path:str) -> int:
+    return solve_grid(read_text_records(path)).value
+
+def solve_part2(path:str) -> int:
+    grid = solve_grid(read_text_records(path))
 
-    start = time()
     image_tiles = {}
-    for chunk in tile_chunks:
+    for chunk in read_text_records(path):
         tile = ImageTile(chunk)
         image_tiles[tile.id] = tile
 
-    image = Image(grid, image_tiles)
-    image.find_monsters([
-        "                  # ",
-        "#    ##    ##    ###",
-        " #  #  #  #  #  #   ",
-    ])
+    return Image(grid, image_tiles).find_monsters(SEA_MONSTER)
+
+if __name__ == '__main__':
+    start = time()
+    print("Product of corners: ", solve_part1('input20.txt'), "\n")
+    print("Part 1 took", time() - start)
+
+    start = time()
+    print("Choppy tiles: ", solve_part2('input20.txt'))
     print("Part 2 took", time() - start)
@@ -81,12 +81,20 @@ def identify_allergens(foods:list[tuple[list[str],list[str]]]) -> dict[str,str]:
 
 
 
-if __name__ == '__main__':
-    with open('input21.txt') as f:
-        foods = [parse_food(l) for l in f.readlines()]
+def read_foods(path:str) -> list[tuple[list[str], list[str]]]:
+    with open(path) as f:
+        return [parse_food(l) for l in f.readlines()]
 
-    print("Occurences of non-allergenic foods:")
-    print(sum(count_occurences(foods, food) for food in get_nonallergenic(foods)))
+def solve_part1(path:str) -> int:
+    foods = read_foods(path)
+    return sum(count_occurences(foods, food) for food in get_nonallergenic(foods))
+
+def solve_part2(path:str) -> str:
+    allergens = identify_allergens(read_foods(path))
+    return ",".join(val for key, val in sorted(allergens.items()))
 
-    allergens = identify_allergens(foods)
-    print(",".join(val for key, val in sorted(allergens.items())))
+
+if __name__ == '__main__':
+    print("Occurences of non-allergenic foods:")
+    print(solve_part1('input21.txt'))
+    print(solve_part2('input21.txt'))
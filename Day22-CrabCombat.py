@@ -1,6 +1,10 @@
 from functools import lru_cache
 from time import time, sleep
 from collections import deque
+from itertools import islice
+
+from aoc2020 import metrics
+from aoc2020.records import read_record_lines
 
 def play(p1:list[int], p2:list[int]) -> list[int]:
     """Gets the final hand of the winning player"""
@@ -22,11 +26,14 @@ def score(deck:list[int]) -> int:
 def play_recursive(p1, p2):
     """Get the winning deck of the recursive combat game."""
     states_seen = set() # List of all states seen. If repeaded p1 wins
+    subgames = 0
 
     while p1 and p2:
         # Check for duplicate play state
         state = str(p1) + str(p2)
         if state in states_seen:
+            metrics.add("states hashed", len(states_seen))
+            metrics.add("subgames", subgames)
             return 1, p1
         states_seen.add(state)
 
@@ -39,6 +46,7 @@ def play_recursive(p1, p2):
         else:
             # had misread the problem and been using p1[:], p2[:] here
             # that makes it run for hours
+            subgames += 1
             winner, _ = play_recursive(p1[:a], p2[:b])
         
         if winner == 1:
@@ -46,20 +54,26 @@ def play_recursive(p1, p2):
         else:
             p2 += [b,a]
     
+    metrics.add("states hashed", len(states_seen))
+    metrics.add("subgames", subgames)
     return (1, p1) if p1 else (2, p2)
 
 
 
-if __name__ == '__main__':
-    players = []
-    with open('input22.txt') as f:
-        for section in f.read().split("\n\n"):
-            players.append(list(map(int, section.strip().split("\n")[1:])))
+def read_decks(path:str) -> list[list[int]]:
+    return [
+        list(map(int, islice(lines, 1, None)))
+        for lines in read_record_lines(path)
+    ]
+
+def solve_part1(path:str) -> int:
+    return score(play(*read_decks(path)))
 
-    # winner = play(players[0][:], players[1][:])
-    # print(winner)
-    # print(score(winner))
+def solve_part2(path:str) -> int:
+    winner, hand = play_recursive(*read_decks(path))
+    return score(hand)
 
-    winner, hand = play_recursive(*players)
-    print(hand)
-    print(score(hand))
+
+if __name__ == '__main__':
+    print(solve_part1('input22.txt'))
+    print(solve_part2('input22.txt'))
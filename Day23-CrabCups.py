@@ -1,5 +1,6 @@
 from time import time
 
+from aoc2020 import metrics
  
 class CupsGame:
     """The game of crab cups"""
@@ -49,10 +50,9 @@ class CupsGame:
         self.current = self.targets[self.current] 
     
     def play(self, count:int):
-        for i in range(count):
+        for _ in range(count):
             self.play_turn()
-            if i and i % 100000 == 0:
-                print(f"{i} turns played")
+        metrics.add("turns played", count)
 
     def __str__(self):
         values = []
@@ -63,18 +63,35 @@ class CupsGame:
 
         return "Crab Cups: " + ",".join(map(str, values)) + ",..."
 
+    def after_one(self, count:int) -> list[int]:
+        """Get the labels of the cups following cup 1."""
+        values = []
+        cursor = self.targets[1]
+        for _ in range(count):
+            values.append(cursor)
+            cursor = self.targets[cursor]
+        return values
 
-if __name__ == '__main__':
-    with open('input23.txt') as f:
-        sequence = f.read().strip()
 
-    game = CupsGame(sequence)
-    print(game)
+def read_sequence(path:str) -> str:
+    with open(path) as f:
+        return f.read().strip()
+
+def solve_part1(path:str) -> str:
+    game = CupsGame(read_sequence(path))
     game.play(100)
-    print(game)
+    return "".join(map(str, game.after_one(game.size - 1)))
 
-    start = time()
-    game = CupsGame(sequence, 1000000)
+def solve_part2(path:str) -> int:
+    game = CupsGame(read_sequence(path), 1000000)
     game.play(10000000)
-    print(game)
+    a, b = game.after_one(2)
+    return a * b
+
+
+if __name__ == '__main__':
+    print(solve_part1('input23.txt'))
+
+    start = time()
+    print(solve_part2('input23.txt'))
     print(time() - start)
@@ -85,10 +85,11 @@ def hex_life(is_alive:bool, live_neighbors:int) -> bool:
     else:
         return live_neighbors == 2
 
-if __name__ == '__main__':
-    with open('input24.txt') as f:
+def read_tiles(path:str) -> set[tuple[int, int]]:
+    """Get the set of black tiles after following every line of a file."""
+    with open(path) as f:
         lines = f.readlines()
-    
+
     tiles = set()
     for line in lines:
         pos = get_target(parse_line(line))
@@ -96,8 +97,16 @@ if __name__ == '__main__':
             tiles.remove(pos)
         else:
             tiles.add(pos)
-    print("Black tiles to start:", len(tiles))
+    return tiles
 
-    game = Life(tiles, hex_adj, hex_life)
+def solve_part1(path:str) -> int:
+    return len(read_tiles(path))
+
+def solve_part2(path:str) -> int:
+    game = Life(read_tiles(path), hex_adj, hex_life)
     game.play(100)
-    print("Black tiles after play:", len(game.alive))
+    return len(game.alive)
+
+if __name__ == '__main__':
+    print("Black tiles to start:", solve_part1('input24.txt'))
+    print("Black tiles after play:", solve_part2('input24.txt'))
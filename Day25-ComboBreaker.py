@@ -20,8 +20,11 @@ def get_encrypt_key(pk1, pk2):
     return encrypt(pk2, loop1)
     
 
-if __name__ == '__main__':
-    with open('input25.txt') as f:
+def solve_part1(path:str) -> int:
+    with open(path) as f:
         card_key, door_key = map(int, f.readlines())
+    return get_encrypt_key(card_key, door_key)
+
 
-    print(get_encrypt_key(card_key, door_key))
+if __name__ == '__main__':
+    print(solve_part1('input25.txt'))
@@ -1,34 +1,71 @@
+from itertools import chain, islice
+from typing import Iterable
+
+SLOPES = ((1, 1), (1, 3), (1, 5), (1, 7), (2, 1)) # (down, right)
+TREES = str.maketrans(".#", "01")
+
 def count_trees(grid : list[list[int]], velocity : tuple[int, int]) -> int:
     width = len(grid[0])
 
     count = 0
     j = 0
-    for row in grid[::velocity[0]][1:]:
+    for row in islice(grid, velocity[0], None, velocity[0]):
         j += velocity[1]
         count += row[j % width]
 
     return count
 
+def pack_row(line : str) -> int:
+    """Pack a row of the map into an int, with bit j set if there is a tree
+    in column j."""
+    return int(line.translate(TREES)[::-1], 2)
 
-if __name__ == "__main__":
-    with open("input3.txt", "r") as f:
+def count_trees_multi(
+    rows : Iterable[int], width : int, slopes : Iterable[tuple[int, int]]
+) -> list[int]:
+    """Count the trees hit on each slope in one pass over the packed rows."""
+    slopes = list(slopes)
+    counts = [0] * len(slopes)
+    for i, row in enumerate(rows):
+        if not i:
+            continue # the start is never a tree that's hit
+        for s, (down, right) in enumerate(slopes):
+            if i % down == 0:
+                counts[s] += row >> (i // down * right % width) & 1
+
+    return counts
+
+def count_trees_in_file(path : str, slopes : Iterable[tuple[int, int]]) -> list[int]:
+    """Count the trees hit on each slope, reading the map one row at a time."""
+    with open(path, "r") as f:
+        lines = filter(None, (line.strip() for line in f))
+        first = next(lines, "")
+        if not first:
+            return [0 for _ in slopes]
+        rows = map(pack_row, chain([first], lines))
+        return count_trees_multi(rows, len(first), slopes)
+
+
+def read_grid(path : str) -> list[list[bool]]:
+    with open(path, "r") as f:
         lines = f.readlines()
-    
-    grid = [
+
+    return [
         [c == "#" for c in line.strip()]
         for line in lines
     ]
 
-    print("Number of trees hit (1, 3):", count_trees(grid, (1, 3)))
+def solve_part1(path : str) -> int:
+    return count_trees_in_file(path, [(1, 3)])[0]
 
+def solve_part2(path : str) -> int:
     total = 1
-    for slope in (
-        (1, 1),
-        (1, 3),
-        (1, 5),
-        (1, 7),
-        (2, 1)
-    ):
-        total *= count_trees(grid, slope)
-    
-    print(total)
+    for count in count_trees_in_file(path, SLOPES):
+        total *= count
+
+    return total
+
+
+if __name__ == "__main__":
+    print("Number of trees hit (1, 3):", solve_part1("input3.txt"))
+    print(solve_part2("input3.txt"))
@@ -1,8 +1,11 @@
+import re
+from typing import Callable, Iterable, Iterator
 
+from aoc2020.records import read_text_records
 
-def get_passports(contents : str) -> list[dict[str, str]]:
-    """Extracts passport details from a string"""
-    for part in contents.split("\n\n"):
+def get_passports(records : Iterable[str]) -> Iterator[dict[str, str]]:
+    """Extracts passport details from a stream of records"""
+    for part in records:
         # empty part
         if not part.strip():
             continue
@@ -10,67 +13,88 @@ def get_passports(contents : str) -> list[dict[str, str]]:
         passport = dict(field.split(":") for field in part.split())
         yield passport
 
-def count_valid(passports : list[dict[str, str]], fields : list[str]) -> int:
+def count_valid(passports : Iterable[dict[str, str]], fields : list[str]) -> int:
     """Counts the passports that have the right fields"""
     return sum(
         all(field in passport for field in fields)
         for passport in passports
     )
 
-def is_valid(passport : dict[str, str]) -> bool:
-    """Strict check of password validity."""
-
-    try:
-        return all((
-            len(passport["byr"]) == 4,
-            1920 <= int(passport["byr"]) <= 2002,
-
-            len(passport["iyr"]) == 4,
-            2010 <= int(passport["iyr"]) <= 2020,
-
-            len(passport["eyr"]) == 4,
-            2020 <= int(passport["eyr"]) <= 2030,
-
-            (
-                len(passport["hgt"]) == 5 and
-                passport["hgt"][3:] == "cm" and
-                150 <= int(passport["hgt"][:3]) <= 193
-            ) or (
-                len(passport["hgt"]) == 4 and
-                passport["hgt"][2:] == "in" and
-                59 <= int(passport["hgt"][:2]) <= 76
-            ),
-
-            len(passport["hcl"]) == 7,
-            passport["hcl"][0] == "#",
-            int(passport["hcl"][1:], 16) >= 0, # failure will be an exception
-
-            passport["ecl"] in "amb blu brn gry grn hzl oth".split(),
-
-            len(passport["pid"]) == 9,
-            int(passport["pid"]) >= 0, # failure will be an exception
-
-            #ignore cid
-        ))
-
-    except:
-        # There was a missing field, or a field was not convertable
-        return False    
-
-
-def count_valid_strict(passports : list[dict[str, str]]) -> int:
+# Each field must fully match one of its patterns. If the pattern has a
+# group, the number in it must also lie within the (low, high) bounds.
+SCHEMA = {
+    "byr": [(r"([0-9]{4})", (1920, 2002))],
+    "iyr": [(r"([0-9]{4})", (2010, 2020))],
+    "eyr": [(r"([0-9]{4})", (2020, 2030))],
+    "hgt": [(r"([0-9]{3})cm", (150, 193)), (r"([0-9]{2})in", (59, 76))],
+    "hcl": [(r"#[0-9a-f]{6}", None)],
+    "ecl": [(r"amb|blu|brn|gry|grn|hzl|oth", None)],
+    "pid": [(r"[0-9]{9}", None)],
+    #ignore cid
+}
+
+def compile_rule(pattern : str, bounds : tuple[int, int]) -> Callable[[str], bool]:
+    match = re.compile(pattern).fullmatch
+    if bounds is None:
+        return lambda value: match(value) is not None
+
+    low, high = bounds
+    def check(value : str) -> bool:
+        found = match(value)
+        return found is not None and low <= int(found.group(1)) <= high
+    return check
+
+def compile_schema(schema : dict) -> list[tuple[str, Callable[[str], bool]]]:
+    """Turn a schema into a (field, check) pair for each field."""
+    validators = []
+    for field, rules in schema.items():
+        checks = [compile_rule(pattern, bounds) for pattern, bounds in rules]
+        if len(checks) == 1:
+            validators.append((field, checks[0]))
+        else:
+            validators.append((field, lambda value, checks=checks: any(
+                check(value) for check in checks
+            )))
+    return validators
+
+VALIDATORS = compile_schema(SCHEMA)
+
+def is_valid(passport : dict[str, str], validators : list = VALIDATORS) -> bool:
+    """Strict check of passport validity, stopping at the first bad field."""
+    for field, check in validators:
+        value = passport.get(field)
+        if value is None or not check(value):
+            return False
+    return True
+
+def count_valid_strict(passports : Iterable[dict[str, str]]) -> int:
     """Counts the number of actually valid passports"""
     return sum(
         is_valid(passport)
         for passport in passports
     )
 
-if __name__ == "__main__":
-    with open("input4.txt", "r") as f:
-        passports = list(get_passports(f.read()))
+MANDATORY = list(SCHEMA)
 
-    mandatory = "byr iyr eyr hgt hcl ecl pid".split()
+def validate_stream(
+    records : Iterable[str], fields : list[str] = MANDATORY, validators : list = VALIDATORS
+) -> tuple[int, int]:
+    """Counts the passports with the right fields and the strictly valid
+    ones in a single pass, holding one passport at a time."""
+    present = strict = 0
+    for passport in get_passports(records):
+        if all(field in passport for field in fields):
+            present += 1
+            strict += is_valid(passport, validators)
 
-    print("Passports:", len(passports))
-    print("Valid:", count_valid(passports, mandatory))
-    print("Strictly valid:", count_valid_strict(passports))
+    return present, strict
+
+def solve_part1(path : str) -> int:
+    return validate_stream(read_text_records(path))[0]
+
+def solve_part2(path : str) -> int:
+    return validate_stream(read_text_records(path))[1]
+
+if __name__ == "__main__":
+    print("Valid:", solve_part1("input4.txt"))
+    print("Strictly valid:", solve_part2("input4.txt"))
@@ -1,3 +1,12 @@
+try:
+    import numpy as np
+except ImportError: # passes are decoded one at a time instead
+    np = None
+
+BITS = bytes.maketrans(b"FBLR", b"0101")
+PASS_LENGTH = 10
+SEATS = 1 << PASS_LENGTH
+
 def decode_pass(boarding_pass : str) -> tuple[int, int, int]:
     """Get the row, column and seat id from a boarding pass"""
 
@@ -6,18 +15,86 @@ def decode_pass(boarding_pass : str) -> tuple[int, int, int]:
 
     return row, column, row * 8 + column
 
-if __name__ == "__main__":
-    with open("input5.txt", "r") as f:
+def read_seats(path : str) -> list[int]:
+    with open(path, "r") as f:
         passes = f.readlines()
 
-    seats = [seat for row, col, seat in map(decode_pass, passes)]
+    return [seat for row, col, seat in map(decode_pass, passes)]
+
+def decode_passes(data : bytes):
+    """Get the seat ids of every pass in a file's contents at once. The
+    row and column together are just a 10 bit number, B and R being 1s.
+
+    With NumPy, a file of one pass per line is viewed as a 2D array of
+    bytes and decoded in one step, returning an array. Anything else (or
+    no NumPy) is decoded one pass at a time, returning a list."""
+    data = data.strip()
+    if np is not None and data:
+        seat_ids = _decode_lines(data)
+        if seat_ids is not None:
+            return seat_ids
+
+    passes = data.split()
+    if any(len(p) != PASS_LENGTH for p in passes):
+        raise ValueError(f"Boarding passes must be {PASS_LENGTH} characters long")
+    return [int(p.translate(BITS), 2) for p in passes]
+
+def _decode_lines(data : bytes):
+    """Decode passes on lines of equal length, or get None if the lines
+    aren't laid out like that."""
+    newline = b"\r\n" if data[PASS_LENGTH:PASS_LENGTH + 2] == b"\r\n" else b"\n"
+    stride = PASS_LENGTH + len(newline)
+    rows, extra = divmod(len(data) + len(newline), stride)
+    if extra:
+        return None
+
+    chars = np.frombuffer(data, dtype=np.uint8)
+    as_rows = np.lib.stride_tricks.as_strided
+    breaks = as_rows(chars[PASS_LENGTH:], (rows - 1, len(newline)), (stride, 1))
+    if (breaks != np.frombuffer(newline, dtype=np.uint8)).any():
+        return None
 
+    passes = as_rows(chars, (rows, PASS_LENGTH), (stride, 1))
+    ones = (passes == ord("B")) | (passes == ord("R"))
+    if not (ones | (passes == ord("F")) | (passes == ord("L"))).all():
+        raise ValueError("Boarding passes may only contain F, B, L and R")
+    return ones.view(np.uint8) @ (1 << np.arange(PASS_LENGTH - 1, -1, -1, dtype=np.uint16))
+
+def read_seat_ids(path : str):
+    with open(path, "rb") as f:
+        return decode_passes(f.read())
+
+def find_seats(seat_ids) -> tuple[int, int]:
+    """Get the highest seat id and the first free seat between the lowest
+    and highest, or None, from a bitmap of the seats taken."""
+    if np is not None:
+        taken = np.zeros(SEATS, dtype=bool)
+        taken[seat_ids] = True
+        filled = np.flatnonzero(taken)
+        if not len(filled):
+            raise ValueError("No boarding passes")
+        low, high = filled[0], filled[-1]
+        free = np.flatnonzero(~taken[low:high])
+        return int(high), int(low + free[0]) if len(free) else None
+
+    taken = bytearray(SEATS)
+    for seat in seat_ids:
+        taken[seat] = 1
+    low, high = taken.find(1), taken.rfind(1)
+    if low < 0:
+        raise ValueError("No boarding passes")
+    free = taken.find(0, low, high)
+    return high, free if free >= 0 else None
+
+def solve_part1(path : str) -> int:
+    return find_seats(read_seat_ids(path))[0]
+
+def solve_part2(path : str) -> int:
+    return find_seats(read_seat_ids(path))[1]
+
+if __name__ == "__main__":
     print("Highest seat id:")
-    print(max(seats))
+    print(solve_part1("input5.txt"))
 
     print("Missing seat:")
-    seats = sorted(seats)
-    for i, seat in enumerate(seats, seats[0]):
-        if i != seat:
-            print(i)
-            break
+    print(solve_part2("input5.txt"))
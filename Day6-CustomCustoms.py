@@ -1,18 +1,48 @@
+from functools import reduce
+from operator import and_, or_
+from string import ascii_lowercase
+from typing import Iterable
+
+from aoc2020.records import read_records
+
+# The bit for each question, indexed by the byte of its letter
+QUESTION_BITS = [0] * 256
+for i, c in enumerate(ascii_lowercase.encode()):
+    QUESTION_BITS[c] = 1 << i
+
+def person_mask(person : bytes) -> int:
+    """Get the questions a person answered yes to as a 26 bit int."""
+    return reduce(or_, map(QUESTION_BITS.__getitem__, person), 0)
+
+def group_masks(group : bytes) -> tuple[int, int]:
+    """Get the questions anyone and everyone in a group answered yes to."""
+    masks = list(map(person_mask, group.split()))
+    return reduce(or_, masks, 0), reduce(and_, masks) if masks else 0
+
 def count_any_yes(group : str) -> int:
-    return len(set(group.replace("\n",""))) # exclude the newline
+    return group_masks(group.encode())[0].bit_count()
 
 def count_all_yes(group : str) -> int:
-    yes = set(chr(i) for i in range(ord("a"), ord("z") + 1))
-    for person in group.split("\n"):
-        if person: # might have an empty line at end
-            yes &= set(person)
+    return group_masks(group.encode())[1].bit_count()
+
+def count_yes(groups : Iterable[bytes]) -> tuple[int, int]:
+    """Sum the questions anyone and everyone answered yes to over every
+    group, in one pass."""
+    any_total = all_total = 0
+    for group in groups:
+        anyone, everyone = group_masks(group)
+        any_total += anyone.bit_count()
+        all_total += everyone.bit_count()
+
+    return any_total, all_total
+
+def solve_part1(path : str) -> int:
+    return count_yes(read_records(path))[0]
 
-    return len(yes)
+def solve_part2(path : str) -> int:
+    return count_yes(read_records(path))[1]
 
 if __name__ == "__main__":
-    with open("input6.txt") as f:
-        groups = f.read().split("\n\n")
-    
     print("Sum of counts is:")
-    print(sum(map(count_any_yes, groups)))
-    print(sum(map(count_all_yes, groups)))
+    print(solve_part1("input6.txt"))
+    print(solve_part2("input6.txt"))
@@ -1,14 +1,39 @@
-from collections import Counter
-from functools import lru_cache
+import mmap
+import struct
+from array import array
+from collections import Counter, deque
+from typing import Iterable
 
-def get_contents(path : str) -> dict[str, dict[str, int]]:
+class BagRules(dict):
+    """The bags each color of bag contains, as a dict of Counters, along
+    with the reverse: the colors of bag that directly contain each color."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parents = reverse_edges(self)
+        self.totals = None # see count_all_contents
+
+def reverse_edges(contents : dict[str, dict[str, int]]) -> dict[str, set[str]]:
+    """Get the colors of bag that directly contain each color."""
+    parents = {}
+    for bag, children in contents.items():
+        for color in children:
+            parents.setdefault(color, set()).add(bag)
+    return parents
+
+def get_parents(contents : dict[str, dict[str, int]]) -> dict[str, set[str]]:
+    """Get the reverse edges of a graph, using the index if it has one."""
+    if isinstance(contents, BagRules):
+        return contents.parents
+    return reverse_edges(contents)
+
+def get_contents(path : str) -> BagRules:
     """Get a weighted, directed graph of bags.
-    No protection for the case of cycles.
+    Cycles are allowed here; count_all_contents reports them.
     """
     with open(path, "r") as f:
         lines = f.readlines();
     
-    contents = {}
+    contents = BagRules()
 
     # Could use regex here, but hardly seems necessary due to the input size.
     for line in lines:
@@ -26,6 +51,7 @@ def get_contents(path : str) -> dict[str, dict[str, int]]:
             color = parts[1] + " " + parts[2]
             count = int(parts[0])
             contents[bag][color] = count
+            contents.parents.setdefault(color, set()).add(bag)
     
     return contents
 
@@ -34,41 +60,308 @@ def get_poss_containers(
     contents : dict[str, dict[str, int]]
     ) -> list[str]:
     """Returns a list of all bags which can contain a bag of a given color."""
+    parents = get_parents(contents)
 
-    to_check = [target]
+    to_check = deque([target])
     valid = set()
     while to_check:
-        target_color = to_check.pop()
+        target_color = to_check.popleft()
 
-        for cont_color in contents:
-            if cont_color not in valid and target_color in contents[cont_color]:
+        for cont_color in parents.get(target_color, ()):
+            if cont_color not in valid:
                 valid.add(cont_color)
                 to_check.append(cont_color)
     
     return list(valid)
+
+def get_poss_containers_batch(
+    targets : Iterable[str],
+    contents : dict[str, dict[str, int]]
+    ) -> dict[str, list[str]]:
+    """Finds the bags which can contain each of many colors in one traversal.
+    Each bag carries a bitmask of the targets it can contain, which is
+    pushed up to its parents until nothing changes, so bags shared by
+    many targets' ancestries are only visited again when they learn of
+    new targets. Cycles are fine."""
+    parents = get_parents(contents)
+    targets = list(dict.fromkeys(targets))
+
+    masks = {}
+    for bit, target in enumerate(targets):
+        for cont_color in parents.get(target, ()):
+            masks[cont_color] = masks.get(cont_color, 0) | 1 << bit
+
+    to_check = deque(masks)
+    queued = set(masks)
+    while to_check:
+        color = to_check.popleft()
+        queued.remove(color)
+        mask = masks[color]
+
+        for cont_color in parents.get(color, ()):
+            old = masks.get(cont_color, 0)
+            if old | mask != old:
+                masks[cont_color] = old | mask
+                if cont_color not in queued:
+                    queued.add(cont_color)
+                    to_check.append(cont_color)
+
+    containers = {target: [] for target in targets}
+    for color, mask in masks.items():
+        bits = bin(mask)[:1:-1] # lowest bit first
+        bit = bits.find("1")
+        while bit >= 0:
+            containers[targets[bit]].append(color)
+            bit = bits.find("1", bit + 1)
+    return containers
                 
+def find_cycle(colors : set[str], contents : dict[str, dict[str, int]]) -> list[str]:
+    """Find a cycle of bags among colors, each of which is known to contain
+    another of them."""
+    path = {} # color -> position in path
+    color = next(iter(colors))
+    while color not in path:
+        path[color] = len(path)
+        color = next(child for child in contents[color] if child in colors)
+    return list(path)[path[color]:] + [color]
+
+def count_all_contents(contents : dict[str, dict[str, int]]) -> dict[str, int]:
+    """Counts the bags within every color of bag, returning a lookup table.
+    Bags are counted from the innermost out (Kahn's algorithm), so there's
+    no recursion. Colors with no rule hold nothing. Raises ValueError if
+    the rules have a cycle. The table is kept on BagRules for later calls.
+    """
+    if isinstance(contents, BagRules) and contents.totals is not None:
+        return contents.totals
+    parents = get_parents(contents)
+
+    waiting = {bag: len(children) for bag, children in contents.items()}
+    ready = deque(bag for bag, count in waiting.items() if not count)
+    ready.extend(color for color in parents if color not in contents)
+
+    totals = {}
+    while ready:
+        color = ready.popleft()
+        totals[color] = sum(
+            (1 + totals[child]) * count
+            for child, count in contents.get(color, {}).items()
+        )
+
+        for cont_color in parents.get(color, ()):
+            waiting[cont_color] -= 1
+            if not waiting[cont_color]:
+                ready.append(cont_color)
+
+    if len(totals) < len(waiting.keys() | parents.keys()):
+        cycle = find_cycle(waiting.keys() - totals.keys(), contents)
+        raise ValueError("Bags contain themselves: " + " -> ".join(cycle))
+
+    if isinstance(contents, BagRules):
+        contents.totals = totals
+    return totals
+
 def count_contents(
     target : str,
     contents : dict[str, dict[str, int]]
     ) -> int:
     """Counts the number of bags contained within a given color of bag."""
+    return count_all_contents(contents)[target]
+
+
+class CompactBagGraph:
+    """Bag rules with colors interned to ids 0..n-1 and the edges in CSR
+    form: the bags in color i are targets[offsets[i]:offsets[i+1]], with
+    counts alongside, and likewise the bags directly containing color i are
+    sources[rev_offsets[i]:rev_offsets[i+1]].
+
+    The arrays are array.arrays when built from rules, or memoryviews of a
+    memory-mapped file when loaded, so a saved graph is usable without
+    parsing or copying it.
+    """
+    MAGIC = b"AOCBAGS1"
+    # magic, byte order check, colors, edges, bytes of names
+    HEADER = struct.Struct("=8sIxxxxQQQ")
+    BYTE_ORDER = 0x01020304
+    # (attribute, typecode) of the arrays in file order
+    ARRAYS = (
+        ("offsets", "q"), ("targets", "I"), ("counts", "I"),
+        ("rev_offsets", "q"), ("sources", "I"),
+    )
+
+    def __init__(self, names : list[str], arrays : dict, backing=None):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        for name, _ in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self._backing = backing # the mmap, when loaded from a file
+        self.totals = None # see count_all_contents
 
-    @lru_cache() # Cache results to speed up recursion
-    def rec_count(color : str) -> int:
-        """Recursively count the contents of a given color."""
-        return sum(
-            (1 + rec_count(child)) * count
-            for child, count in contents[color].items()
+    @classmethod
+    def from_rules(cls, contents : dict[str, dict[str, int]]) -> "CompactBagGraph":
+        ids = {}
+        for bag, children in contents.items():
+            ids.setdefault(bag, len(ids))
+            for color in children:
+                ids.setdefault(color, len(ids))
+
+        n = len(ids)
+        edges = [() for _ in range(n)]
+        for bag, children in contents.items():
+            edges[ids[bag]] = [(ids[color], count) for color, count in children.items()]
+
+        offsets, targets, counts = array("q", [0]), array("I"), array("I")
+        in_degree = [0] * n
+        for children in edges:
+            for child, count in children:
+                targets.append(child)
+                counts.append(count)
+                in_degree[child] += 1
+            offsets.append(len(targets))
+
+        rev_offsets = array("q", [0])
+        for degree in in_degree:
+            rev_offsets.append(rev_offsets[-1] + degree)
+        sources = array("I", bytes(4 * len(targets)))
+        filled = rev_offsets[:-1]
+        for bag, children in enumerate(edges):
+            for child, _ in children:
+                sources[filled[child]] = bag
+                filled[child] += 1
+
+        arrays = dict(
+            offsets=offsets, targets=targets, counts=counts,
+            rev_offsets=rev_offsets, sources=sources,
         )
+        return cls(list(ids), arrays)
 
-    return rec_count(target)
+    def save(self, path : str):
+        """Write the graph as a binary file, in this machine's byte order."""
+        names = "\n".join(self.names).encode()
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(
+                self.MAGIC, self.BYTE_ORDER, len(self.names), len(self.targets), len(names)
+            ))
+            for name, typecode in self.ARRAYS:
+                data = getattr(self, name)
+                f.write(data.tobytes())
+                f.write(bytes(-f.tell() % 8)) # keep each array 8 byte aligned
+            f.write(names)
 
+    @classmethod
+    def load(cls, path : str) -> "CompactBagGraph":
+        """Map a saved graph into memory. Only the names are copied."""
+        with open(path, "rb") as f:
+            backing = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-if __name__ == "__main__":
-    graph = get_contents("input7.txt")
+        magic, order, n, edges, names_size = cls.HEADER.unpack_from(backing)
+        if magic != cls.MAGIC:
+            raise ValueError(f"{path} is not a saved bag graph")
+        if order != cls.BYTE_ORDER:
+            raise ValueError(f"{path} was saved with the other byte order")
+
+        view = memoryview(backing)
+        pos = cls.HEADER.size
+        arrays = {}
+        for name, typecode in cls.ARRAYS:
+            length = n + 1 if name.endswith("offsets") else edges
+            size = length * struct.calcsize(typecode)
+            arrays[name] = view[pos:pos + size].cast(typecode)
+            pos += size + -size % 8
+
+        names = bytes(view[pos:pos + names_size]).decode().split("\n") if n else []
+        return cls(names, arrays, backing)
+
+    def close(self):
+        """Release the file of a loaded graph."""
+        if self._backing is not None:
+            for name, _ in self.ARRAYS:
+                getattr(self, name).release()
+            self._backing.close()
+            self._backing = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_poss_containers(self, target : str) -> list[str]:
+        """Returns a list of all bags which can contain a bag of a given color."""
+        if target not in self.ids:
+            return []
+        rev_offsets, sources = self.rev_offsets, self.sources
+
+        seen = bytearray(len(self.names))
+        to_check = deque([self.ids[target]])
+        valid = []
+        while to_check:
+            color = to_check.popleft()
+            for cont_color in sources[rev_offsets[color]:rev_offsets[color + 1]]:
+                if not seen[cont_color]:
+                    seen[cont_color] = 1
+                    valid.append(cont_color)
+                    to_check.append(cont_color)
 
+        return [self.names[color] for color in valid]
+
+    def count_all_contents(self) -> list[int]:
+        """Counts the bags within every color of bag, indexed by id, from
+        the innermost out. Raises ValueError if the rules have a cycle.
+        The table is kept for later calls."""
+        if self.totals is not None:
+            return self.totals
+        offsets, targets, counts = self.offsets, self.targets, self.counts
+        rev_offsets, sources = self.rev_offsets, self.sources
+        n = len(self.names)
+
+        waiting = [offsets[i + 1] - offsets[i] for i in range(n)]
+        ready = deque(i for i in range(n) if not waiting[i])
+        totals = [0] * n
+        done = 0
+        while ready:
+            color = ready.popleft()
+            done += 1
+            start, end = offsets[color], offsets[color + 1]
+            totals[color] = sum(
+                (1 + totals[child]) * count
+                for child, count in zip(targets[start:end], counts[start:end])
+            )
+
+            for cont_color in sources[rev_offsets[color]:rev_offsets[color + 1]]:
+                waiting[cont_color] -= 1
+                if not waiting[cont_color]:
+                    ready.append(cont_color)
+
+        if done < n:
+            # Each bag still waiting contains another that is, as in find_cycle
+            path = {} # id -> position in path
+            color = next(i for i in range(n) if waiting[i])
+            while color not in path:
+                path[color] = len(path)
+                color = next(
+                    child for child in targets[offsets[color]:offsets[color + 1]]
+                    if waiting[child]
+                )
+            cycle = list(path)[path[color]:] + [color]
+            raise ValueError("Bags contain themselves: " + " -> ".join(self.names[i] for i in cycle))
+
+        self.totals = totals
+        return totals
+
+    def count_contents(self, target : str) -> int:
+        return self.count_all_contents()[self.ids[target]]
+
+
+def solve_part1(path : str) -> int:
+    return len(get_poss_containers("shiny gold", get_contents(path)))
+
+def solve_part2(path : str) -> int:
+    return count_contents("shiny gold", get_contents(path))
+
+
+if __name__ == "__main__":
     print("Containers that can hold a shiny gold bag:")
-    print(len(get_poss_containers("shiny gold", graph)))
+    print(solve_part1("input7.txt"))
 
     print("No of bags in a shiny gold:")
-    print(count_contents("shiny gold", graph))
+    print(solve_part2("input7.txt"))
@@ -1,3 +1,10 @@
+from array import array
+from collections import Counter
+
+NOP, ACC, JMP = range(3)
+OPCODES = {"nop": NOP, "acc": ACC, "jmp": JMP}
+NAMES = {op: instr for instr, op in OPCODES.items()}
+
 class accumulator:
     """Wrapper for a value"""
     def __init__(self):
@@ -82,10 +89,264 @@ def get_fixed_acc_val(code : list[tuple[str, int]]) -> int:
     return -1
 
 
-if __name__ == "__main__":
-    with open("input8.txt") as f:
-        code = parse_code(f.readlines())
+class Trace:
+    """What one traced run of a HandheldVM did."""
+    def __init__(self, size : int, last : int):
+        self.hits = array("q", bytes(8 * size)) # times each line ran
+        self.jumps = Counter()                   # (from, to) of jmps taken
+        self.ring = array("q", [-1] * last)      # last lines run, wrapping
+        self.steps = 0
+        self.acc = 0
+        self.ptr = 0                             # where the run stopped
+
+    @property
+    def recent(self) -> list[int]:
+        """The last lines run, oldest first."""
+        last = len(self.ring)
+        if self.steps <= last:
+            return self.ring[:self.steps].tolist()
+        start = self.steps % last
+        return (self.ring[start:] + self.ring[:start]).tolist()
+
+    def hotspots(self, count : int = 10) -> list[tuple[int, int]]:
+        """The (line, hits) of the lines run most often."""
+        ranked = sorted(range(len(self.hits)), key=self.hits.__getitem__, reverse=True)
+        return [(line, self.hits[line]) for line in ranked[:count] if self.hits[line]]
+
+    def taken_edges(self) -> dict[int, dict[int, int]]:
+        """The edges between lines the run took and how often: the jumps,
+        and falling through to the next line from every other line run."""
+        edges = {}
+        for (src, dst), taken in self.jumps.items():
+            edges.setdefault(src, {})[dst] = taken
+        for line, hits in enumerate(self.hits):
+            if hits and line not in edges:
+                edges[line] = {line + 1: hits}
+        return edges
+
+    def loops(self) -> list[dict]:
+        """Each loop the run went round, i.e. each strongly connected
+        component of the lines run and the edges taken between them: the
+        line it was entered at (the first of its lines run), its lines, how
+        often it came back round to the entry and the edges taken out of it."""
+        edges = self.taken_edges()
+
+        # Tarjan's algorithm, without recursion. Searching from line 0
+        # first numbers the lines in the order they were first run.
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        components = []
+        for root in sorted(edges):
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(edges[root]))]
+            while work:
+                line, targets = work[-1]
+                for dst in targets:
+                    if dst not in edges:
+                        continue # the exit, or where the run was stopped
+                    if dst not in index:
+                        index[dst] = low[dst] = len(index)
+                        stack.append(dst)
+                        on_stack.add(dst)
+                        work.append((dst, iter(edges[dst])))
+                        break
+                    if dst in on_stack:
+                        low[line] = min(low[line], index[dst])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[line])
+                    if low[line] == index[line]:
+                        component = set()
+                        while line not in component:
+                            component.add(stack.pop())
+                        on_stack -= component
+                        components.append(component)
+
+        loops = []
+        for lines in components:
+            if len(lines) == 1 and not any(line in edges[line] for line in lines):
+                continue # run through, not round
+            entry = min(lines, key=index.__getitem__)
+            exits = {
+                (src, dst): taken
+                for src in lines for dst, taken in edges[src].items() if dst not in lines
+            }
+            repeats = sum(edges[src].get(entry, 0) for src in lines)
+            loops.append({"entry": entry, "lines": sorted(lines), "repeats": repeats, "exits": exits})
+        return sorted(loops, key=lambda loop: loop["repeats"], reverse=True)
+
+class HandheldVM:
+    """A program compiled to parallel arrays of integer opcodes and
+    arguments, run without any per-step dispatch on strings."""
+    def __init__(self, code : list[tuple[str, int]]):
+        try:
+            self.ops = array("b", [OPCODES[instr] for instr, _ in code])
+        except KeyError as e:
+            raise ValueError(f"Unknown instruction: {e.args[0]}") from None
+        self.args = array("q", [val for _, val in code])
+        self.visited = bytearray(len(code)) # reused by every run
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def run(self) -> tuple[int, int]:
+        """Run from the start until the pointer leaves the program or
+        reaches an instruction for the second time. Returns the value of
+        the accumulator and the final pointer."""
+        ops, args, visited = self.ops, self.args, self.visited
+        visited[:] = bytes(len(visited))
+        n = len(ops)
+        acc = ptr = 0
+
+        while 0 <= ptr < n and not visited[ptr]:
+            visited[ptr] = 1
+            op = ops[ptr]
+            if op == JMP:
+                ptr += args[ptr]
+            else:
+                if op == ACC:
+                    acc += args[ptr]
+                ptr += 1
+
+        return acc, ptr
+
+    def trace(self, max_steps : int = None, last : int = 32) -> Trace:
+        """Run from the start like run, recording a Trace. With max_steps,
+        lines may repeat and the run only stops on exit or after that many
+        steps, so hot loops show up in the hit counts. This is a separate
+        loop so that untraced runs pay nothing for it."""
+        trace = Trace(len(self), max(1, last))
+        hits, jumps, ring = trace.hits, trace.jumps, trace.ring
+        ops, args, visited = self.ops, self.args, self.visited
+        visited[:] = bytes(len(visited))
+        n, size = len(ops), len(ring)
+        acc = ptr = steps = 0
+
+        while 0 <= ptr < n:
+            if max_steps is None:
+                if visited[ptr]:
+                    break
+                visited[ptr] = 1
+            elif steps >= max_steps:
+                break
+
+            hits[ptr] += 1
+            ring[steps % size] = ptr
+            steps += 1
 
-    print("Acc value at first loop:", execute_until_loop(code)[0])
+            op = ops[ptr]
+            if op == JMP:
+                jumps[ptr, ptr + args[ptr]] += 1
+                ptr += args[ptr]
+            else:
+                if op == ACC:
+                    acc += args[ptr]
+                ptr += 1
+
+        trace.steps, trace.acc, trace.ptr = steps, acc, ptr
+        return trace
+
+    def run_until_loop(self) -> tuple[int, bool]:
+        """Same as execute_until_loop: the value of the accumulator at the
+        first repeat instruction (or exit) and whether the code looped."""
+        acc, ptr = self.run()
+        return acc, 0 <= ptr < len(self)
+
+    def run_to_exit(self) -> int:
+        """Get the value of the accumulator when the program exits. Raises
+        ValueError if it loops instead."""
+        acc, ptr = self.run()
+        if 0 <= ptr < len(self):
+            raise ValueError(f"Program loops at line {ptr}")
+        return acc
+
+    def exiting_lines(self) -> bytearray:
+        """Mark the lines from which the program exits, found by searching
+        back from the exit along the reversed control flow."""
+        ops, args = self.ops, self.args
+        n = len(ops)
+
+        # Predecessors of each line in CSR form, with line n the exit
+        nexts = array("q", (
+            i + args[i] if ops[i] == JMP else i + 1 for i in range(n)
+        ))
+        for i, nxt in enumerate(nexts):
+            if not 0 <= nxt < n:
+                nexts[i] = n
+        offsets = array("q", bytes(8 * (n + 2)))
+        for nxt in nexts:
+            offsets[nxt + 1] += 1
+        for i in range(1, n + 2):
+            offsets[i] += offsets[i - 1]
+        preds = array("q", bytes(8 * n))
+        filled = offsets[:]
+        for i, nxt in enumerate(nexts):
+            preds[filled[nxt]] = i
+            filled[nxt] += 1
+
+        exits = bytearray(n + 1)
+        exits[n] = 1
+        to_check = [n]
+        while to_check:
+            line = to_check.pop()
+            for pred in preds[offsets[line]:offsets[line + 1]]:
+                if not exits[pred]:
+                    exits[pred] = 1
+                    to_check.append(pred)
+
+        return exits
+
+    def repair(self) -> tuple[int, str, int]:
+        """Find the jmp or nop to swap so the program exits, in linear time.
+        Returns the line changed, its new instruction and the value of the
+        accumulator on exit. The program is left unchanged. Raises
+        ValueError if the program already exits."""
+        ops, args, visited = self.ops, self.args, self.visited
+        n = len(ops)
+        exits = self.exiting_lines()
+        if exits[0]:
+            raise ValueError("Program already exits, there's nothing to repair")
+
+        # Follow the original program: the fix is the first swap that
+        # lands on a line that exits (lines after it haven't run yet)
+        visited[:] = bytes(n)
+        ptr = 0
+        while 0 <= ptr < n and not visited[ptr]:
+            visited[ptr] = 1
+            op = ops[ptr]
+            swapped = ptr + 1 if op == JMP else ptr + args[ptr]
+            if op != ACC and (not 0 <= swapped < n or exits[swapped]):
+                break
+            ptr = ptr + args[ptr] if op == JMP else ptr + 1
+        else:
+            raise ValueError("No single change makes the program exit")
+
+        ops[ptr] = NOP if op == JMP else JMP
+        try:
+            acc = self.run_to_exit()
+        finally:
+            ops[ptr] = op
+        return ptr, NAMES[NOP if op == JMP else JMP], acc
+
+
+def read_code(path : str) -> list[tuple[str, int]]:
+    with open(path) as f:
+        return parse_code(f.readlines())
+
+def solve_part1(path : str) -> int:
+    return HandheldVM(read_code(path)).run_until_loop()[0]
+
+def solve_part2(path : str) -> int:
+    return HandheldVM(read_code(path)).repair()[2]
+
+
+if __name__ == "__main__":
+    print("Acc value at first loop:", solve_part1("input8.txt"))
 
-    print("Acc value on exit after fix:", get_fixed_acc_val(code))
+    print("Acc value on exit after fix:", solve_part2("input8.txt"))
@@ -1,3 +1,7 @@
+from collections import Counter, deque
+from itertools import accumulate
+from typing import Iterable, Iterator
+
 def first_error(XMAS : list[int], pmbl : int) -> int:
     """Find the first item in XMAS which is not the sum of a pair of the
     previous pmbl entries"""
@@ -16,6 +20,33 @@ def first_error(XMAS : list[int], pmbl : int) -> int:
 
     return -1
 
+def invalid_numbers(XMAS : Iterable[int], pmbl : int = 25) -> Iterator[int]:
+    """Yield every number in a stream which is not the sum of two different
+    numbers among the previous pmbl. The window is kept as a multiset, so
+    adding and dropping a number is O(1) and checking one is O(pmbl)."""
+    if pmbl < 1:
+        raise ValueError(f"The preamble must have at least one number, not {pmbl}")
+    return _invalid_numbers(XMAS, pmbl)
+
+def _invalid_numbers(XMAS : Iterable[int], pmbl : int) -> Iterator[int]:
+    window = deque()
+    counts = Counter()
+    for x in XMAS:
+        if len(window) == pmbl:
+            # every y in the window whose partner x - y is too; one of them
+            # other than x / 2 means there's a pair of different numbers
+            halves = counts.keys() & map(x.__sub__, counts)
+            if not halves or (x % 2 == 0 and halves == {x // 2}):
+                yield x
+
+            old = window.popleft()
+            counts[old] -= 1
+            if not counts[old]:
+                del counts[old]
+
+        window.append(x)
+        counts[x] += 1
+
 def find_range_with_sum(values : list[int], target : int) -> tuple[int, int]:
     """Given a list of positive integers, find a range which sums to a target
     value."""
@@ -33,13 +64,83 @@ def find_range_with_sum(values : list[int], target : int) -> tuple[int, int]:
 
     return -1, -1
 
-if __name__ == "__main__":
-    with open("input9.txt") as f:
-        XMAS = [int(l) for l in f.readlines()]
+class RangeSumIndex:
+    """Prefix sums of a sequence, for finding ranges of at least two
+    numbers with a given sum, and a sparse table for the smallest and
+    largest number in any range in O(1). Values may be negative.
+
+    A range values[i:j] sums to T when prefix[j] - prefix[i] == T, so each
+    end j is checked with one lookup of the first position of each prefix
+    sum. That is a single pass over the sequence per batch of targets,
+    O(n) for each target still unanswered, rather than O(1).
+    """
+    def __init__(self, values : list[int]):
+        self.values = values
+        self.prefix = list(accumulate(values, initial=0))
+        self.first = {}
+        for i, total in enumerate(self.prefix):
+            self.first.setdefault(total, i)
+
+        # mins[k][i] (and maxs) covers values[i:i + 2**k]
+        self.mins, self.maxs = [values], [values]
+        width = 1
+        while 2 * width <= len(values):
+            mins, maxs = self.mins[-1], self.maxs[-1]
+            self.mins.append(list(map(min, mins[:-width], mins[width:])))
+            self.maxs.append(list(map(max, maxs[:-width], maxs[width:])))
+            width *= 2
+
+    def find_ranges(self, targets : Iterable[int]) -> dict[int, tuple[int, int]]:
+        """Find a range (i, j), values[i:j], summing to each target, the one
+        ending first, or (-1, -1)."""
+        found = {}
+        pending = set(targets)
+        first = self.first
+        for j, total in enumerate(self.prefix):
+            if not pending:
+                break
+            for target in list(pending):
+                i = first.get(total - target, j)
+                if i <= j - 2:
+                    found[target] = i, j
+                    pending.remove(target)
 
-    error = first_error(XMAS, 25)
-    print("First error:", error)
+        found.update((target, (-1, -1)) for target in pending)
+        return found
 
-    i, j = find_range_with_sum(XMAS, error)
-    section = XMAS[i:j]
-    print("Encryption weakness:", min(section) + max(section))
+    def min_max(self, i : int, j : int) -> tuple[int, int]:
+        """Get the smallest and largest of values[i:j], which mustn't be empty."""
+        k = (j - i).bit_length() - 1
+        mins, maxs = self.mins[k], self.maxs[k]
+        return min(mins[i], mins[j - 2**k]), max(maxs[i], maxs[j - 2**k])
+
+    def weaknesses(self, targets : Iterable[int]) -> dict[int, int]:
+        """Get the sum of the smallest and largest number in the range for
+        each target, or None where there is no range."""
+        weaknesses = {}
+        for target, (i, j) in self.find_ranges(targets).items():
+            weaknesses[target] = sum(self.min_max(i, j)) if i >= 0 else None
+        return weaknesses
+
+def read_xmas(path : str) -> list[int]:
+    with open(path) as f:
+        return [int(l) for l in f.readlines()]
+
+def stream_xmas(path : str) -> Iterator[int]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield int(line)
+
+def solve_part1(path : str) -> int:
+    return next(invalid_numbers(stream_xmas(path), 25), -1)
+
+def solve_part2(path : str) -> int:
+    XMAS = read_xmas(path)
+    error = next(invalid_numbers(XMAS, 25), -1)
+
+    return RangeSumIndex(XMAS).weaknesses([error])[error]
+
+if __name__ == "__main__":
+    print("First error:", solve_part1("input9.txt"))
+    print("Encryption weakness:", solve_part2("input9.txt"))
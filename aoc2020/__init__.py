@@ -0,0 +1,58 @@
+"""Shared tooling for running the daily solutions.
+
+The solutions themselves live in the DayN-*.py scripts at the top of the
+repository, each of which exposes solve_part1(path) and solve_part2(path).
+They can be imported from here by day or by puzzle name, and each script is
+only run the first time one of its names is used:
+
+    from aoc2020 import day23, jurassic_jigsaw
+    from aoc2020.day23 import CupsGame
+    game = CupsGame("389125467")
+"""
+import importlib
+import importlib.abc
+import importlib.util
+import sys
+
+class _AliasLoader(importlib.abc.Loader):
+    """Loads a puzzle name as the aoc2020.dayN module it stands for, so
+    both names share one module."""
+    def __init__(self, target:str):
+        self.target = target
+
+    def create_module(self, spec):
+        return importlib.import_module(self.target)
+
+    def exec_module(self, module):
+        pass
+
+class DayFinder(importlib.abc.MetaPathFinder):
+    """Lets the import system find aoc2020.dayN and the puzzle names,
+    including in worker processes that didn't import them themselves."""
+    def find_spec(self, fullname:str, path=None, target=None):
+        package, _, name = fullname.partition(".")
+        if package != __name__ or not name or "." in name:
+            return None
+        # imported here so that `import aoc2020` alone stays cheap
+        from aoc2020.days import day_names, day_path
+
+        day = day_names().get(name)
+        if day is None:
+            return None
+        if name != f"day{day}":
+            return importlib.util.spec_from_loader(fullname, _AliasLoader(f"{__name__}.day{day}"))
+        return importlib.util.spec_from_file_location(fullname, day_path(day))
+
+if not any(isinstance(finder, DayFinder) for finder in sys.meta_path):
+    sys.meta_path.append(DayFinder()) # after the usual finders, for aoc2020's own modules
+
+def __getattr__(name:str):
+    from aoc2020.days import day_names
+
+    if name not in day_names():
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
+
+def __dir__() -> list[str]:
+    from aoc2020.days import day_names
+    return sorted(set(globals()) | set(day_names()))
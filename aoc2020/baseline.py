@@ -0,0 +1,79 @@
+"""Benchmark baselines, to tell whether a change made a solution slower.
+
+A baseline is a JSON file holding the median time and, when profiled, the
+traced peak memory of each part of each day on each input. Inputs are
+labelled by file name, or by size and seed for generated inputs, so one
+baseline can hold results for several sizes. Saving a run updates the
+entries it covers and keeps the rest.
+
+    python -m aoc2020.runner 1 18 -g 1000 -n 9 --save-baseline base.json
+    (swap get_2020_3 for get_2020_3a)
+    python -m aoc2020.runner 1 18 -g 1000 -n 9 --compare base.json
+"""
+import json
+import os
+
+# (entry field, display scale, unit, word when higher, word when lower)
+MEASURES = (
+    ("median", 1e3, "ms", "slower", "faster"),
+    ("memory", 2**-20, "MiB", "more memory", "less memory"),
+)
+
+def entry_key(day:int, part:int, label:str) -> str:
+    return f"day{day}-part{part}-{label}"
+
+def input_label(path:str, size:int=None, seed:int=0) -> str:
+    """Get the name an input is stored under in a baseline."""
+    if size is not None:
+        return f"generated-{size}-seed{seed}"
+    return os.path.basename(path)
+
+def record(result, label:str) -> dict:
+    """Get the baseline entry for a PartResult."""
+    return {
+        "day": result.day,
+        "part": result.part,
+        "input": label,
+        "size": result.size,
+        "median": result.median,
+        "runs": len(result.times),
+        "memory": result.memory.traced_peak if result.memory else None,
+    }
+
+def load(path:str) -> dict:
+    """Read a baseline, or get an empty one if the file doesn't exist."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save(path:str, entries:list[dict]):
+    """Add entries to a baseline file, replacing older ones for the same
+    day, part and input."""
+    baseline = load(path)
+    for entry in entries:
+        baseline[entry_key(entry["day"], entry["part"], entry["input"])] = entry
+
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+def compare(old:dict, new:dict, threshold:float=0.1) -> list[tuple[bool, str]]:
+    """Compare a new entry against the baseline one. Returns (regressed,
+    description) for each measure that changed by more than the threshold,
+    as a fraction of the baseline value."""
+    changes = []
+    for field, scale, unit, worse, better in MEASURES:
+        before, after = old.get(field), new.get(field)
+        if not before or after is None:
+            continue
+
+        change = after / before - 1
+        if abs(change) <= threshold:
+            continue
+        changes.append((
+            change > 0,
+            f"{worse if change > 0 else better}: "
+            f"{before * scale:.2f} -> {after * scale:.2f} {unit} ({change:+.0%})"
+        ))
+    return changes
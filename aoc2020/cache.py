@@ -0,0 +1,76 @@
+"""A persistent cache of answers.
+
+Entries are keyed on the day, the part, the SHA-256 of the input file and
+the SHA-256 of the day's script together with the aoc2020 modules it
+imports, so editing a solution only invalidates the answers for that day,
+and editing a shared module invalidates those of the days using it. Each entry is a small JSON file and the directory is
+kept under a size limit by removing the least recently used entries.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / ".aoc_cache"
+
+def file_hash(path:str) -> str:
+    """Get the SHA-256 of a file, without reading it all into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ResultCache:
+    """Answers stored on disk, with least recently used eviction."""
+    def __init__(self, directory:str=DEFAULT_DIR, max_bytes:int=1 << 20):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, day:int, part:int, input_path:str, source_paths:list[str]) -> str:
+        """Get the key for an answer to one part of a day on an input, given
+        the paths of all the code the answer depends on."""
+        sources = hashlib.sha256()
+        for path in source_paths:
+            sources.update(bytes.fromhex(file_hash(path)))
+        return f"day{day}-part{part}-{file_hash(input_path)[:16]}-{sources.hexdigest()[:16]}"
+
+    def get(self, key:str) -> dict:
+        """Get a stored entry, or None if there isn't one. Marks the entry
+        as recently used."""
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        os.utime(path) # the modification time is the last use
+        return entry
+
+    def put(self, key:str, answer):
+        """Store an answer, evicting old entries if the cache is too big."""
+        path = self.directory / f"{key}.json"
+        with open(path, "w") as f:
+            json.dump({"answer": answer}, f)
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until under the size limit."""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        """Remove every entry."""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
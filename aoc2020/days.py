@@ -0,0 +1,67 @@
+"""Finding and importing the DayN-*.py scripts.
+
+The scripts' names aren't valid module names, so the aoc2020 package's
+finder loads them from their paths as aoc2020.dayN. Each is only executed
+once per process.
+"""
+import ast
+import importlib
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DAYS = range(1, 26)
+
+def day_path(day:int) -> Path:
+    """Get the path of the script for a given day."""
+    matches = sorted(ROOT.glob(f"Day{day}-*.py"))
+    if not matches:
+        raise ValueError(f"No solution found for day {day}")
+    return matches[0]
+
+def source_paths(day:int) -> list[Path]:
+    """Get the script for a given day and every aoc2020 module it imports,
+    directly or through those modules, i.e. all the code its answers
+    depend on."""
+    package = Path(__file__).resolve().parent
+    paths = [day_path(day)]
+    for path in paths: # grows as imports are found
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module]
+                if node.module == "aoc2020":
+                    names += [f"aoc2020.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+
+            for name in names:
+                parts = name.split(".")
+                if parts[0] != "aoc2020" or len(parts) != 2:
+                    continue
+                module = package / f"{parts[1]}.py"
+                if module.exists() and module not in paths:
+                    paths.append(module)
+    return paths
+
+def snake_name(path:Path) -> str:
+    """Get the snake_case name of a day's puzzle from its script's name,
+    e.g. Day20-JurassicJigsaw.py -> jurassic_jigsaw."""
+    title = path.stem.split("-", 1)[1]
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", title).lower()
+
+def day_names() -> dict[str, int]:
+    """Get the day for each name a day can be imported under."""
+    names = {}
+    for path in ROOT.glob("Day*-*.py"):
+        day = int(path.stem.split("-", 1)[0][3:])
+        names[f"day{day}"] = day
+        names[snake_name(path)] = day
+    return names
+
+def load_day(day:int):
+    """Import the script for a given day as a module, or get the one
+    already imported."""
+    day_path(day) # raises ValueError if there's no script for the day
+    return importlib.import_module(f"aoc2020.day{day}")
@@ -0,0 +1,833 @@
+"""Seeded, size-parameterised input generators for every day.
+
+Each generator takes a size and a random.Random and returns the text of an
+input file along with the answers to each part. Answers are known from the
+way the input was built (or from a cheap direct calculation). They are None
+where the only way to get them is to run the full simulation.
+
+    python -m aoc2020.generators 8 100000 -s 1 -o big8.txt
+"""
+import argparse
+import random
+import re
+import string
+import sys
+from collections import Counter, deque
+from itertools import product
+from math import prod
+
+def _words(rng:random.Random, count:int, length:int=6) -> list[str]:
+    """Get a number of distinct random lowercase words."""
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=length)))
+    return rng.sample(sorted(words), count)
+
+def _primes_above(low:int, count:int) -> list[int]:
+    """Get the first count primes greater than low."""
+    primes = []
+    n = low + 1
+    while len(primes) < count:
+        if n > 1 and all(n % d for d in range(2, int(n ** 0.5) + 1)):
+            primes.append(n)
+        n += 1
+    return primes
+
+
+### Day 1 ###
+def report_repair(size:int, rng:random.Random):
+    """size entries, exactly one pair and one triple summing to 2020.
+    Every other entry is too large to be part of either."""
+    while True:
+        a = rng.randint(1, 2019)
+        b = rng.randint(1, 2017)
+        c = rng.randint(1, 2018 - b)
+        small = [a, 2020 - a, b, c, 2020 - b - c]
+        pairs = [
+            (i, j) for i in range(5) for j in range(i + 1, 5)
+            if small[i] + small[j] == 2020
+        ]
+        triples = [
+            (i, j, k) for i in range(5) for j in range(i + 1, 5)
+            for k in range(j + 1, 5) if small[i] + small[j] + small[k] == 2020
+        ]
+        if pairs == [(0, 1)] and triples == [(2, 3, 4)] and len(set(small[2:])) == 3:
+            break
+
+    entries = small + [rng.randint(2021, 10 ** 6) for _ in range(size - 5)]
+    rng.shuffle(entries)
+    return "\n".join(map(str, entries)) + "\n", {1: a * (2020 - a), 2: b * c * (2020 - b - c)}
+
+
+### Day 2 ###
+def password_philosophy(size:int, rng:random.Random):
+    """size password lines."""
+    letters = "abcdefghij"
+    lines = []
+    valid = valid_2 = 0
+    for _ in range(size):
+        low = rng.randint(1, 8)
+        high = rng.randint(low, low + 8)
+        char = rng.choice(letters)
+        password = "".join(
+            char if rng.random() < 0.3 else rng.choice(letters)
+            for _ in range(rng.randint(1, 20))
+        )
+        lines.append(f"{low}-{high} {char}: {password}")
+
+        valid += low <= password.count(char) <= high
+        valid_2 += (
+            (low <= len(password) and password[low-1] == char) !=
+            (high <= len(password) and password[high-1] == char)
+        )
+    return "\n".join(lines) + "\n", {1: valid, 2: valid_2}
+
+
+### Day 3 ###
+def toboggan_trajectory(size:int, rng:random.Random, width:int=31):
+    """size rows of forest."""
+    grid = [[rng.random() < 0.2 for _ in range(width)] for _ in range(size)]
+
+    def trees(down, right):
+        return sum(
+            grid[r][r // down * right % width]
+            for r in range(down, size, down)
+        )
+
+    slopes = ((1, 1), (1, 3), (1, 5), (1, 7), (2, 1))
+    text = "\n".join("".join("#" if t else "." for t in row) for row in grid)
+    return text + "\n", {1: trees(1, 3), 2: prod(trees(*s) for s in slopes)}
+
+
+### Day 4 ###
+PASSPORT_FIELDS = {
+    "byr": (lambda r: str(r.randint(1920, 2002)), lambda r: str(r.randint(1800, 1919))),
+    "iyr": (lambda r: str(r.randint(2010, 2020)), lambda r: str(r.randint(2021, 2099))),
+    "eyr": (lambda r: str(r.randint(2020, 2030)), lambda r: str(r.randint(1950, 2019))),
+    "hgt": (
+        lambda r: r.choice((f"{r.randint(150, 193)}cm", f"{r.randint(59, 76)}in")),
+        lambda r: r.choice((f"{r.randint(194, 250)}cm", f"{r.randint(10, 58)}in", "170")),
+    ),
+    "hcl": (
+        lambda r: "#" + "".join(r.choices("0123456789abcdef", k=6)),
+        lambda r: r.choice(("", "#")) + "".join(r.choices("0123456789abcdef", k=r.choice((3, 5)))),
+    ),
+    "ecl": (
+        lambda r: r.choice("amb blu brn gry grn hzl oth".split()),
+        lambda r: r.choice("red pnk xyz blue".split()),
+    ),
+    "pid": (
+        lambda r: "".join(r.choices(string.digits, k=9)),
+        lambda r: "".join(r.choices(string.digits, k=r.choice((8, 10)))),
+    ),
+}
+
+def passport_processing(size:int, rng:random.Random):
+    """size passports, some missing fields and some with invalid values."""
+    records = []
+    present = strict = 0
+    for _ in range(size):
+        fields = {}
+        has_all = is_valid = True
+        for name, (good, bad) in PASSPORT_FIELDS.items():
+            roll = rng.random()
+            if roll < 0.05:
+                has_all = is_valid = False
+                continue
+            if roll < 0.15:
+                is_valid = False
+                fields[name] = bad(rng)
+            else:
+                fields[name] = good(rng)
+        if rng.random() < 0.5:
+            fields["cid"] = str(rng.randint(1, 999))
+
+        present += has_all
+        strict += is_valid
+
+        items = [f"{k}:{v}" for k, v in fields.items()]
+        rng.shuffle(items)
+        records.append("".join(
+            item + rng.choice(" \n") for item in items
+        ).strip())
+
+    return "\n\n".join(records) + "\n", {1: present, 2: strict}
+
+
+### Day 5 ###
+def binary_boarding(size:int, rng:random.Random):
+    """size boarding passes (at most 1022, the plane only has 1024 seats)
+    covering a contiguous block of seats with one missing."""
+    size = max(2, min(size, 1022))
+    first = rng.randint(0, 1022 - size)
+    seats = list(range(first, first + size + 1))
+    missing = seats.pop(rng.randint(1, size - 1))
+    rng.shuffle(seats)
+
+    def encode(seat):
+        row = format(seat >> 3, "07b").replace("0", "F").replace("1", "B")
+        col = format(seat & 7, "03b").replace("0", "L").replace("1", "R")
+        return row + col
+
+    return "\n".join(map(encode, seats)) + "\n", {1: first + size, 2: missing}
+
+
+### Day 6 ###
+def custom_customs(size:int, rng:random.Random):
+    """size groups of 1-5 people."""
+    groups = []
+    any_yes = all_yes = 0
+    for _ in range(size):
+        core = set(rng.sample(string.ascii_lowercase, rng.randint(0, 6)))
+        people = [
+            core | set(rng.sample(string.ascii_lowercase, rng.randint(1, 8)))
+            for _ in range(rng.randint(1, 5))
+        ]
+        any_yes += len(set.union(*people))
+        all_yes += len(set.intersection(*people))
+        groups.append("\n".join("".join(rng.sample(sorted(p), len(p))) for p in people))
+
+    return "\n\n".join(groups) + "\n", {1: any_yes, 2: all_yes}
+
+
+### Day 7 ###
+def handy_haversacks(size:int, rng:random.Random):
+    """size bag colours forming an acyclic graph, with shiny gold in the middle."""
+    size = max(size, 2)
+    adjectives = "light dark bright muted faded dotted vibrant pale wavy posh".split()
+    names = [f"{rng.choice(adjectives)} c{i}" for i in range(size)]
+    gold = size // 2
+    names[gold] = "shiny gold"
+
+    # Bags only contain bags later in the list, so the graph is acyclic
+    children = [
+        {j: rng.randint(1, 5) for j in rng.sample(range(i + 1, size), min(rng.randint(0, 4), size - i - 1))}
+        for i in range(size)
+    ]
+
+    lines = []
+    for i, contents in enumerate(children):
+        if contents:
+            inner = ", ".join(
+                f"{n} {names[j]} {'bag' if n == 1 else 'bags'}"
+                for j, n in contents.items()
+            )
+        else:
+            inner = "no other bags"
+        lines.append(f"{names[i]} bags contain {inner}.")
+    rng.shuffle(lines)
+
+    # Part 1: every bag with a path to shiny gold
+    holders = {gold}
+    for i in range(gold - 1, -1, -1):
+        if any(j in holders for j in children[i]):
+            holders.add(i)
+
+    # Part 2: bags inside shiny gold, deepest first
+    totals = [0] * size
+    for i in range(size - 1, gold - 1, -1):
+        totals[i] = sum(n * (1 + totals[j]) for j, n in children[i].items())
+
+    return "\n".join(lines) + "\n", {1: len(holders) - 1, 2: totals[gold]}
+
+
+### Day 8 ###
+def handheld_halting(size:int, rng:random.Random):
+    """size instructions. A single jmp sends execution back to an earlier
+    line; changing it to a nop lets the program run off the end."""
+    size = max(size, 2)
+    broken = rng.randint(1, size - 1)
+    code = []
+    for i in range(size):
+        if i == broken:
+            code.append(("jmp", rng.randint(0, i) - i))
+            continue
+
+        # Everything else only moves forward, and no other change can
+        # escape the loop through broken.
+        end = broken if i < broken else size
+        roll = rng.random()
+        if roll < 0.5:
+            code.append(("acc", rng.randint(-50, 50)))
+        elif roll < 0.75 and end - i >= 2:
+            code.append(("jmp", rng.randint(2, min(5, end - i))))
+        else:
+            code.append(("nop", rng.randint(-i, max(0, min(broken, end) - i))))
+
+    def run(fixed):
+        acc = ptr = 0
+        seen = set()
+        while ptr < size and ptr not in seen:
+            seen.add(ptr)
+            op, arg = code[ptr]
+            if op == "jmp" and not (fixed and ptr == broken):
+                ptr += arg
+                continue
+            if op == "acc":
+                acc += arg
+            ptr += 1
+        return acc
+
+    text = "\n".join(f"{op} {arg:+d}" for op, arg in code)
+    return text + "\n", {1: run(False), 2: run(True)}
+
+
+### Day 9 ###
+def encoding_error(size:int, rng:random.Random, preamble:int=25):
+    """At least size numbers. The sum of the first few preamble numbers is
+    placed once the window has moved far enough that it cannot be a sum of
+    two of its predecessors. The values roughly double every preamble
+    numbers, so large sizes produce very large integers."""
+    values = rng.sample(range(1, 2 * preamble + 1), preamble)
+    run = rng.randint(2, 5)
+    error = sum(values[:run])
+    weakness = min(values[:run]) + max(values[:run])
+
+    placed = None
+    target = rng.randint(preamble, max(preamble, size - 1))
+    while len(values) < size or placed is None:
+        window = values[-preamble:]
+        if placed is None and len(values) >= target and min(window) > error:
+            placed = len(values)
+            values.append(error)
+            continue
+
+        smallest = sorted(set(window))[:6]
+        y, z = rng.sample(smallest, 2)
+        values.append(y + z)
+
+    return "\n".join(map(str, values)) + "\n", {1: error, 2: weakness}
+
+
+### Day 10 ###
+def adapter_array(size:int, rng:random.Random):
+    """size adapters with gaps of 1 or 3."""
+    gaps = rng.choices((1, 3), weights=(3, 1), k=size)
+    values = []
+    total = 0
+    for gap in gaps:
+        total += gap
+        values.append(total)
+    rng.shuffle(values)
+
+    # Each run of 1-gaps can be crossed in a tribonacci number of ways, and
+    # every 3-gap must be taken.
+    tribonacci = [1, 1, 2]
+    ways = 1
+    for run in re.findall("1+", "".join(map(str, gaps)) + "3"):
+        while len(tribonacci) <= len(run):
+            tribonacci.append(sum(tribonacci[-3:]))
+        ways *= tribonacci[len(run)]
+
+    counts = Counter(gaps)
+    return "\n".join(map(str, values)) + "\n", {1: counts[1] * (counts[3] + 1), 2: ways}
+
+
+### Day 11 ###
+def seating_system(size:int, rng:random.Random):
+    """A size x size seating plan."""
+    text = "\n".join(
+        "".join(rng.choices("L.", weights=(7, 3), k=size))
+        for _ in range(size)
+    )
+    return text + "\n", {1: None, 2: None}
+
+
+### Day 12 ###
+def rain_risk(size:int, rng:random.Random):
+    """size navigation instructions."""
+    lines = []
+    for _ in range(size):
+        action = rng.choice("NSEWLRF")
+        value = rng.choice((90, 180, 270)) if action in "LR" else rng.randint(1, 100)
+        lines.append(f"{action}{value}")
+
+    steps = {"N": (0, 1), "S": (0, -1), "E": (1, 0), "W": (-1, 0)}
+    ship, heading = [0, 0], [1, 0]
+    wp_ship, waypoint = [0, 0], [10, 1]
+    for line in lines:
+        action, value = line[0], int(line[1:])
+        if action in steps:
+            dx, dy = steps[action]
+            ship = [ship[0] + dx * value, ship[1] + dy * value]
+            waypoint = [waypoint[0] + dx * value, waypoint[1] + dy * value]
+        elif action in "LR":
+            # Quarter turns clockwise
+            for _ in range(value // 90 if action == "R" else 4 - value // 90):
+                heading = [heading[1], -heading[0]]
+                waypoint = [waypoint[1], -waypoint[0]]
+        else:
+            ship = [ship[0] + heading[0] * value, ship[1] + heading[1] * value]
+            wp_ship = [wp_ship[0] + waypoint[0] * value, wp_ship[1] + waypoint[1] * value]
+
+    norm = lambda pos: abs(pos[0]) + abs(pos[1])
+    return "\n".join(lines) + "\n", {1: norm(ship), 2: norm(wp_ship)}
+
+
+### Day 13 ###
+def shuttle_search(size:int, rng:random.Random):
+    """size buses spread over twice as many slots, each with a prime id
+    larger than the schedule so the offsets are all distinct residues."""
+    size = max(size, 2)
+    slots = 2 * size
+    offsets = [0] + sorted(rng.sample(range(1, slots), size - 1))
+    buses = rng.sample(_primes_above(slots, 2 * size), size)
+    schedule = ["x"] * slots
+    for offset, bus in zip(offsets, buses):
+        schedule[offset] = str(bus)
+
+    now = rng.randint(10 ** 5, 10 ** 6)
+    best = None
+    for bus in schedule:
+        if bus == "x": continue
+        wait = -now % int(bus)
+        if best is None or wait < best[0]:
+            best = (wait, wait * int(bus))
+
+    # Chinese remainder theorem: t = -offset (mod bus) for every bus
+    t, period = 0, 1
+    for offset, bus in zip(offsets, buses):
+        t += period * ((-offset - t) * pow(period, -1, bus) % bus)
+        period *= bus
+
+    return f"{now}\n{','.join(schedule)}\n", {1: best[1], 2: t}
+
+
+### Day 14 ###
+def docking_data(size:int, rng:random.Random, floating:int=6):
+    """size memory writes, with a new mask every few writes. Masks have at
+    most floating X bits to keep part 2 tractable."""
+    lines = []
+    mem, mem2 = {}, {}
+    mask = None
+    for i in range(size):
+        if mask is None or rng.random() < 0.2:
+            bits = rng.choices("01", k=36)
+            for pos in rng.sample(range(36), rng.randint(0, floating)):
+                bits[pos] = "X"
+            mask = "".join(bits)
+            lines.append(f"mask = {mask}")
+
+        address = rng.randint(0, 2 ** 16)
+        value = rng.randint(0, 2 ** 36 - 1)
+        lines.append(f"mem[{address}] = {value}")
+
+        mem[address] = int("".join(
+            b if b != "X" else v for b, v in zip(mask, format(value, "036b"))
+        ), 2)
+
+        base = [
+            "1" if b == "1" else v
+            for b, v in zip(mask, format(address, "036b"))
+        ]
+        floats = [i for i, b in enumerate(mask) if b == "X"]
+        for choice in product("01", repeat=len(floats)):
+            for pos, bit in zip(floats, choice):
+                base[pos] = bit
+            mem2[int("".join(base), 2)] = value
+
+    return "\n".join(lines) + "\n", {1: sum(mem.values()), 2: sum(mem2.values())}
+
+
+### Day 15 ###
+def rambunctious_recitation(size:int, rng:random.Random):
+    """size distinct starting numbers."""
+    start = rng.sample(range(2 * size + 1), size)
+
+    last_seen = {v: i for i, v in enumerate(start[:-1], 1)}
+    value = start[-1]
+    for turn in range(len(start), 2020):
+        seen = last_seen.get(value)
+        last_seen[value] = turn
+        value = turn - seen if seen else 0
+
+    return ",".join(map(str, start)) + "\n", {1: value, 2: None}
+
+
+### Day 16 ###
+TICKET_FIELDS = (
+    "departure location, departure station, departure platform, "
+    "departure track, departure date, departure time, arrival location, "
+    "arrival station, arrival platform, arrival track, class, duration, "
+    "price, route, row, seat, train, type, wagon, zone"
+).split(", ")
+
+def ticket_translation(size:int, rng:random.Random):
+    """size nearby tickets, about a fifth of which have an invalid value.
+    Rule k accepts values from bands k and above, so the rules can be
+    placed one at a time starting from the last."""
+    fields = len(TICKET_FIELDS)
+    band = lambda k: (100 * k + 1, 100 * k + 50)
+    rules = [
+        f"{name}: {band(k)[0]}-{band(fields - 1)[1]} or "
+        f"{5000 + 10 * k}-{5005 + 10 * k}"
+        for k, name in enumerate(TICKET_FIELDS)
+    ]
+
+    # column[k] is where rule k's values live on the tickets
+    column = rng.sample(range(fields), fields)
+
+    def ticket(lowest_band):
+        values = [0] * fields
+        for k in range(fields):
+            values[column[k]] = rng.randint(*band(rng.randint(k, fields - 1) if not lowest_band else k))
+        return values
+
+    ours = ticket(True)
+    nearby = [ticket(True)] + [ticket(False) for _ in range(size - 1)]
+    invalid = 0
+    for values in nearby[1:]:
+        if rng.random() < 0.2:
+            values[rng.randrange(fields)] = bad = rng.randint(6000, 9999)
+            invalid += bad
+    rng.shuffle(nearby)
+
+    departure = prod(ours[column[k]] for k in range(6))
+    text = "\n".join(rules) + "\n\nyour ticket:\n" + ",".join(map(str, ours)) + \
+        "\n\nnearby tickets:\n" + "\n".join(",".join(map(str, t)) for t in nearby)
+    return text + "\n", {1: invalid, 2: departure}
+
+
+### Day 17 ###
+def conway_cubes(size:int, rng:random.Random):
+    """A size x size starting slice."""
+    text = "\n".join(
+        "".join(rng.choices("#.", weights=(4, 6), k=size))
+        for _ in range(size)
+    )
+    return text + "\n", {1: None, 2: None}
+
+
+### Day 18 ###
+class _Flat(int):
+    """Integers where - means *, so + and * share a precedence."""
+    def __add__(self, other): return _Flat(int(self) + int(other))
+    def __sub__(self, other): return _Flat(int(self) * int(other))
+
+class _Swapped(int):
+    """Integers where + and * swap meanings, so + binds tighter."""
+    def __add__(self, other): return _Swapped(int(self) * int(other))
+    def __mul__(self, other): return _Swapped(int(self) + int(other))
+
+def operation_order(size:int, rng:random.Random):
+    """size expressions of single digits, nested up to three deep."""
+    def expression(depth):
+        terms = []
+        for _ in range(rng.randint(2, 5)):
+            if depth < 3 and rng.random() < 0.25:
+                terms.append(f"({expression(depth + 1)})")
+            else:
+                terms.append(str(rng.randint(1, 9)))
+        ops = rng.choices("+*", k=len(terms) - 1)
+        return terms[0] + "".join(f" {op} {term}" for op, term in zip(ops, terms[1:]))
+
+    lines = [expression(0) for _ in range(size)]
+
+    wrap = lambda cls, line: re.sub(r"(\d)", cls.__name__ + r"(\1)", line)
+    flat = sum(eval(wrap(_Flat, line.replace("*", "-"))) for line in lines)
+    swapped = sum(eval(wrap(_Swapped, line.translate(str.maketrans("+*", "*+")))) for line in lines)
+    return "\n".join(lines) + "\n", {1: int(flat), 2: int(swapped)}
+
+
+### Day 19 ###
+def monster_messages(size:int, rng:random.Random, chunks:int=8):
+    """size messages against a grammar of chunks 4-letter blocks followed by
+    a final "a". Each block is one of a small set of words, so whether a
+    message matches can be checked block by block."""
+    rules = {1: '"a"', 2: '"b"'}
+    pairs = ["aa", "ab", "ba", "bb"]
+    leaf = {"a": "1", "b": "2"}
+
+    # Rules 3..10 each match one of two 2-letter words
+    words = {}
+    for r in range(3, 11):
+        first, second = rng.sample(pairs, 2)
+        words[r] = {first, second}
+        rules[r] = " | ".join(" ".join(leaf[c] for c in w) for w in (first, second))
+
+    # Rules 11.. each match two 2-rule sequences
+    blocks = []
+    for r in range(11, 11 + chunks):
+        options = [rng.sample(range(3, 11), 2) for _ in range(2)]
+        rules[r] = " | ".join(f"{a} {b}" for a, b in options)
+        blocks.append({x + y for a, b in options for x in words[a] for y in words[b]})
+    rules[0] = " ".join(map(str, range(11, 11 + chunks))) + " 1"
+
+    def matches(message):
+        return (
+            len(message) == 4 * chunks + 1 and message[-1] == "a" and
+            all(message[4*i : 4*i+4] in block for i, block in enumerate(blocks))
+        )
+
+    messages = []
+    for _ in range(size):
+        message = "".join(rng.choice(sorted(block)) for block in blocks) + "a"
+        roll = rng.random()
+        if roll < 0.3:
+            i = rng.randrange(len(message))
+            message = message[:i] + ("a" if message[i] == "b" else "b") + message[i+1:]
+        elif roll < 0.4:
+            message += rng.choice("ab")
+        messages.append(message)
+
+    lines = [f"{r}: {body}" for r, body in rules.items()]
+    rng.shuffle(lines)
+    text = "\n".join(lines) + "\n\n" + "\n".join(messages)
+    return text + "\n", {1: sum(map(matches, messages)), 2: None}
+
+
+### Day 20 ###
+SEA_MONSTER = [
+    "                  # ",
+    "#    ##    ##    ###",
+    " #  #  #  #  #  #   ",
+]
+
+def _rotate(grid:list[str]) -> list[str]:
+    """Rotate a square block of text 90 degrees clockwise."""
+    return ["".join(row[i] for row in reversed(grid)) for i in range(len(grid[0]))]
+
+def jurassic_jigsaw(size:int, rng:random.Random):
+    """A size x size jigsaw of randomly rotated and flipped tiles, with sea
+    monsters hidden in the image. Tile edges are made unique where possible
+    so the arrangement (and so both answers) is unique. There are only a few
+    hundred distinct 10-bit edges, so beyond about 14 x 14 that fails and
+    the answers are None."""
+    n = 9 * size + 1
+    lattice = [[rng.random() < 0.5 for _ in range(n)] for _ in range(n)]
+
+    # The image is every tile's interior. Plant monsters in it, without
+    # overlapping, then copy it into the lattice.
+    dim = 8 * size
+    image = [[rng.random() < 0.3 for _ in range(dim)] for _ in range(dim)]
+    monster = {(i, j) for i, row in enumerate(SEA_MONSTER) for j, c in enumerate(row) if c == "#"}
+    slots = [(r, c) for r in range(0, dim - 2, 4) for c in range(0, dim - 19, 21)]
+    for top, left in rng.sample(slots, min(len(slots), max(1, len(slots) // 4))):
+        for i, j in monster:
+            image[top + i][left + j] = True
+    for i in range(dim):
+        for j in range(dim):
+            lattice[9 * (i // 8) + 1 + i % 8][9 * (j // 8) + 1 + j % 8] = image[i][j]
+
+    # Make every edge unique (including reversed) by changing the middle of
+    # each clashing edge until it is new.
+    def edge_cells(kind, a, b):
+        if kind == "h":
+            return [(9 * a, 9 * b + k) for k in range(10)]
+        return [(9 * b + k, 9 * a) for k in range(10)]
+
+    seen = set()
+    unique = True
+    for edge in ((kind, a, b) for kind in "hv" for a in range(size + 1) for b in range(size)):
+        cells = edge_cells(*edge)
+        for _ in range(100):
+            bits = "".join("#" if lattice[i][j] else "." for i, j in cells)
+            key = min(bits, bits[::-1])
+            if key not in seen and bits != bits[::-1]:
+                break
+            for i, j in cells[1:-1]:
+                lattice[i][j] = rng.random() < 0.5
+        else:
+            unique = False
+        seen.add(key)
+
+    ids = rng.sample(range(1000, 1000 + 4 * size * size), size * size)
+    tiles = []
+    for t, (i, j) in enumerate(product(range(size), repeat=2)):
+        grid = ["".join("#" if c else "." for c in row[9 * j : 9 * j + 10]) for row in lattice[9 * i : 9 * i + 10]]
+        for _ in range(rng.randrange(4)):
+            grid = _rotate(grid)
+        if rng.random() < 0.5:
+            grid = [row[::-1] for row in grid]
+        tiles.append(f"Tile {ids[t]}:\n" + "\n".join(grid))
+    rng.shuffle(tiles)
+
+    if not unique:
+        return "\n\n".join(tiles) + "\n", {1: None, 2: None}
+
+    # Count every monster in the image in all eight orientations. Planted
+    # ones are almost always the only ones, but this makes sure.
+    shapes = []
+    shape = SEA_MONSTER
+    for _ in range(4):
+        shapes += [shape, [row[::-1] for row in shape]]
+        shape = _rotate(shape)
+    covered = set()
+    for shape in shapes:
+        cells = [(i, j) for i, row in enumerate(shape) for j, c in enumerate(row) if c == "#"]
+        for top in range(dim + 1 - len(shape)):
+            for left in range(dim + 1 - len(shape[0])):
+                if all(image[top + i][left + j] for i, j in cells):
+                    covered.update((top + i, left + j) for i, j in cells)
+
+    corners = ids[0] * ids[size - 1] * ids[size * (size - 1)] * ids[-1]
+    choppy = sum(map(sum, image)) - len(covered)
+    return "\n\n".join(tiles) + "\n", {1: corners, 2: choppy}
+
+
+### Day 21 ###
+ALLERGENS = "dairy eggs fish nuts peanuts sesame shellfish soy wheat".split()
+
+def allergen_assessment(size:int, rng:random.Random):
+    """At least size foods. Each allergen is listed on two foods that share
+    no other ingredient, which pins it to a single ingredient."""
+    sources = dict(zip(ALLERGENS, _words(rng, len(ALLERGENS), 7)))
+    fillers = _words(rng, max(50, size), 5)
+    safe_set = set(fillers)
+
+    foods = []
+    for allergen, source in sources.items():
+        pick = rng.sample(fillers, 12)
+        foods += [(pick[:6] + [source], [allergen]), (pick[6:] + [source], [allergen])]
+
+    for _ in range(size - len(foods)):
+        listed = rng.sample(ALLERGENS, rng.randint(0, 3))
+        unlisted = [s for s in sources.values() if rng.random() < 0.1]
+        ingredients = rng.sample(fillers, rng.randint(3, 10))
+        ingredients += {sources[a] for a in listed}.union(unlisted)
+        foods.append((ingredients, listed))
+    rng.shuffle(foods)
+
+    lines = []
+    safe = 0
+    for ingredients, listed in foods:
+        rng.shuffle(ingredients)
+        safe += sum(i in safe_set for i in ingredients)
+        line = " ".join(ingredients)
+        if listed:
+            line += f" (contains {', '.join(listed)})"
+        lines.append(line)
+
+    canonical = ",".join(sources[a] for a in sorted(ALLERGENS))
+    return "\n".join(lines) + "\n", {1: safe, 2: canonical}
+
+
+### Day 22 ###
+def crab_combat(size:int, rng:random.Random):
+    """Two decks of size cards each, dealt so the plain game ends."""
+    while True:
+        cards = rng.sample(range(1, 2 * size + 1), 2 * size)
+        p1, p2 = deque(cards[:size]), deque(cards[size:])
+        seen = set()
+        while p1 and p2 and (state := (tuple(p1), tuple(p2))) not in seen:
+            seen.add(state)
+            a, b = p1.popleft(), p2.popleft()
+            if a > b:
+                p1 += (a, b)
+            else:
+                p2 += (b, a)
+        if not (p1 and p2):
+            break
+
+    winner = p1 or p2
+    score = sum(i * card for i, card in enumerate(reversed(winner), 1))
+    text = "Player 1:\n" + "\n".join(map(str, cards[:size])) + \
+        "\n\nPlayer 2:\n" + "\n".join(map(str, cards[size:]))
+    return text + "\n", {1: score, 2: None}
+
+
+### Day 23 ###
+def crab_cups(size:int, rng:random.Random):
+    """A random ordering of the nine cups. size is not used, the number of
+    cups and moves is fixed by the puzzle."""
+    cups = rng.sample(range(1, 10), 9)
+    order = cups[:]
+    for _ in range(100):
+        current, moving = order[0], order[1:4]
+        rest = order[4:] + [current]
+        target = current - 1 or 9
+        while target in moving:
+            target = target - 1 or 9
+        i = rest.index(target) + 1
+        order = rest[:i] + moving + rest[i:]
+
+    i = order.index(1)
+    labels = "".join(map(str, order[i + 1:] + order[:i]))
+    return "".join(map(str, cups)) + "\n", {1: labels, 2: None}
+
+
+### Day 24 ###
+def lobby_layout(size:int, rng:random.Random):
+    """size tile paths of 1-20 steps."""
+    # Cube coordinates, independent of the solution's axial ones
+    moves = {
+        "e": (1, -1, 0), "w": (-1, 1, 0), "ne": (1, 0, -1),
+        "sw": (-1, 0, 1), "nw": (0, 1, -1), "se": (0, -1, 1),
+    }
+    lines = []
+    black = set()
+    for _ in range(size):
+        path = rng.choices(list(moves), k=rng.randint(1, 20))
+        lines.append("".join(path))
+        pos = tuple(map(sum, zip(*(moves[m] for m in path))))
+        black ^= {pos}
+
+    return "\n".join(lines) + "\n", {1: len(black), 2: None}
+
+
+### Day 25 ###
+def combo_breaker(size:int, rng:random.Random, modulo:int=20201227):
+    """Two public keys with loop sizes of at most size."""
+    card_loop = rng.randint(1, size)
+    door_loop = rng.randint(1, size)
+    card_key = pow(7, card_loop, modulo)
+    door_key = pow(7, door_loop, modulo)
+    return f"{card_key}\n{door_key}\n", {1: pow(7, card_loop * door_loop, modulo)}
+
+
+GENERATORS = {
+    1: report_repair,
+    2: password_philosophy,
+    3: toboggan_trajectory,
+    4: passport_processing,
+    5: binary_boarding,
+    6: custom_customs,
+    7: handy_haversacks,
+    8: handheld_halting,
+    9: encoding_error,
+    10: adapter_array,
+    11: seating_system,
+    12: rain_risk,
+    13: shuttle_search,
+    14: docking_data,
+    15: rambunctious_recitation,
+    16: ticket_translation,
+    17: conway_cubes,
+    18: operation_order,
+    19: monster_messages,
+    20: jurassic_jigsaw,
+    21: allergen_assessment,
+    22: crab_combat,
+    23: crab_cups,
+    24: lobby_layout,
+    25: combo_breaker,
+}
+
+def generate(day:int, size:int, seed:int=0):
+    """Get the text and known answers of a generated input for a day."""
+    return GENERATORS[day](size, random.Random(f"{day}:{size}:{seed}"))
+
+def write_input(day:int, size:int, path:str, seed:int=0) -> dict:
+    """Write a generated input to a file and return its known answers."""
+    text, answers = generate(day, size, seed)
+    with open(path, "w") as f:
+        f.write(text)
+    return answers
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a puzzle input.")
+    parser.add_argument("day", type=int, choices=GENERATORS)
+    parser.add_argument("size", type=int)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        answers = write_input(args.day, args.size, args.output, args.seed)
+    else:
+        text, answers = generate(args.day, args.size, args.seed)
+        sys.stdout.write(text)
+    print("Answers:", answers, file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
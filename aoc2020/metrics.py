@@ -0,0 +1,38 @@
+"""Counters for the work done inside the solutions' hot loops.
+
+Solutions report totals with metrics.add once a loop is done, never from
+inside it, and while metrics are disabled add is a function that does
+nothing. Where a count can be worked out from state the loop keeps anyway
+the loop pays nothing for it. Otherwise the loop copies metrics.enabled
+into a local first and only counts when it's set, which leaves one test of
+a local per step when disabled.
+
+    from aoc2020 import metrics
+    metrics.add("turns played", turns)
+"""
+from collections import Counter
+
+_counters = Counter()
+
+def _add(name:str, value:int=1):
+    _counters[name] += value
+
+def _ignore(name:str, value:int=1):
+    pass
+
+add = _ignore
+enabled = False
+
+def enable(on:bool=True):
+    """Start (or stop) recording counts."""
+    global add, enabled
+    add = _add if on else _ignore
+    enabled = on
+
+def reset():
+    """Forget every count."""
+    _counters.clear()
+
+def snapshot() -> dict[str, int]:
+    """Get a copy of the current counts."""
+    return dict(_counters)
@@ -0,0 +1,92 @@
+"""Peak memory and allocation profiling for the daily solutions.
+
+A profiled run records the peak resident set size of the process, the peak
+of the memory traced by tracemalloc and the source lines holding the most
+memory near that peak. tracemalloc can only snapshot the allocations that
+are currently alive, so a background thread takes a new snapshot whenever
+the traced memory reaches a new high. Profiling slows a solution down a
+lot, and the snapshots themselves can be large.
+"""
+import sys
+import threading
+import tracemalloc
+
+try:
+    import resource
+except ImportError: # not available on Windows
+    resource = None
+
+class MemoryProfile:
+    """The memory used by one run of a solution."""
+    def __init__(self):
+        self.peak_rss = None   # bytes, for the whole process so far
+        self.traced_peak = 0   # bytes allocated by Python at the peak
+        self.top = []          # (file:line, bytes) near the peak
+
+    def lines(self) -> list[str]:
+        rss = f"{self.peak_rss / 2**20:.1f} MiB" if self.peak_rss else "n/a"
+        lines = [f"peak RSS {rss}, traced peak {self.traced_peak / 2**20:.1f} MiB"]
+        lines += [f"{size / 2**20:>9.2f} MiB  {site}" for site, size in self.top]
+        return lines
+
+class _PeakSampler(threading.Thread):
+    """Snapshot the traced allocations each time they grow past the size of
+    the last snapshot by a given factor."""
+    def __init__(self, interval:float=0.05, growth:float=1.25):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.snapshot = None
+        self.size = 0
+        self.done = threading.Event()
+
+    def sample(self, force:bool=False):
+        current, _ = tracemalloc.get_traced_memory()
+        if force or current > self.size * self.growth:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.size = current
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.done.set()
+        self.join()
+
+def peak_rss() -> int:
+    """Get the peak resident set size of this process in bytes, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, everywhere else kilobytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def profile_memory(func, *args, top:int=5):
+    """Call func(*args) while tracing allocations. Returns its result and a
+    MemoryProfile."""
+    profile = MemoryProfile()
+    sampler = _PeakSampler()
+
+    tracemalloc.start()
+    sampler.start()
+    try:
+        result = func(*args)
+    finally:
+        sampler.stop()
+        current, profile.traced_peak = tracemalloc.get_traced_memory()
+        if sampler.snapshot is None or current >= sampler.size:
+            sampler.sample(force=True)
+        tracemalloc.stop()
+
+    snapshot = sampler.snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, threading.__file__),
+    ))
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        profile.top.append((f"{frame.filename}:{frame.lineno}", stat.size))
+
+    profile.peak_rss = peak_rss()
+    return result, profile
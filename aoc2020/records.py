@@ -0,0 +1,68 @@
+"""Lazy reading of inputs made of blank-line separated records.
+
+The file is memory-mapped and records are found by scanning the map, so
+only one record is ever copied out of the file at a time. This replaces
+f.read().split("\\n\\n"), which holds the whole file twice over before any
+work can start. Inputs made of a few huge records should use
+read_record_lines, which only copies out one line at a time.
+"""
+import mmap
+import os
+import re
+from itertools import chain
+from typing import Iterator
+
+SEPARATOR = re.compile(rb"(?:\r?\n){2,}")
+
+WHITESPACE = b" \t\r\n\x0b\x0c"
+
+def _record_spans(mm:mmap.mmap) -> Iterator[tuple[int, int]]:
+    """Get the (start, end) of each non-empty record in a map, stripped of
+    surrounding whitespace, without copying anything."""
+    separators = (sep.span() for sep in SEPARATOR.finditer(mm))
+    start = 0
+    for end, next_start in chain(separators, [(len(mm), None)]):
+        while start < end and mm[start] in WHITESPACE:
+            start += 1
+        while end > start and mm[end - 1] in WHITESPACE:
+            end -= 1
+        if start < end:
+            yield start, end
+        start = next_start
+
+def _mapped(path:str) -> list[mmap.mmap]:
+    """Get a read-only map of a file, or nothing if the file is empty. The
+    map is unmapped once nothing refers to it any more, so iterators over
+    its lines stay valid after the record iterator is done with."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [] # mmap can't map an empty file
+        return [mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)]
+
+def read_records(path:str) -> Iterator[bytes]:
+    """Iterate through the non-empty records of a file, stripped of
+    surrounding whitespace."""
+    for mm in _mapped(path):
+        for start, end in _record_spans(mm):
+            yield mm[start:end]
+
+def _lines(mm:mmap.mmap, start:int, end:int, encoding:str) -> Iterator[str]:
+    while start < end:
+        stop = mm.find(b"\n", start, end)
+        if stop < 0:
+            stop = end
+        yield mm[start:stop].decode(encoding).rstrip("\r")
+        start = stop + 1
+
+def read_record_lines(path:str, encoding:str="utf-8") -> Iterator[Iterator[str]]:
+    """Iterate through the records of a file, each as an iterator of its
+    lines. Lines are copied out of the map as they are reached, so a record
+    is never held in memory whole."""
+    for mm in _mapped(path):
+        for start, end in _record_spans(mm):
+            yield _lines(mm, start, end, encoding)
+
+def read_text_records(path:str, encoding:str="utf-8") -> Iterator[str]:
+    """Iterate through the records of a file as text, with \\n line endings."""
+    for record in read_records(path):
+        yield record.decode(encoding).replace("\r\n", "\n")
@@ -0,0 +1,303 @@
+"""Run and benchmark the daily solutions.
+
+    python -m aoc2020.runner                 # every day with an input file
+    python -m aoc2020.runner 15 23 -n 5      # two days, five runs per part
+    python -m aoc2020.runner 8 -i big8.txt   # one day on another input
+    python -m aoc2020.runner 7 -g 100000     # a generated input, checking answers
+    python -m aoc2020.runner -j 0 -t 120     # every part at once, two minutes each
+    python -m aoc2020.runner 11 16 -m        # memory use of two days
+    python -m aoc2020.runner 19 22 -c        # counts of the work done
+    python -m aoc2020.runner -g 500 -n 5 --compare base.json
+                                             # check for regressions
+
+Answers are cached between runs (see aoc2020.cache); pass --no-cache to
+always run the solutions, e.g. when benchmarking. Saving or comparing
+against a baseline (see aoc2020.baseline) never uses the cache.
+"""
+import argparse
+import contextlib
+import math
+import os
+import signal
+import statistics
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from aoc2020 import baseline, generators, metrics
+from aoc2020.cache import ResultCache
+from aoc2020.days import DAYS, load_day, source_paths
+from aoc2020.profiling import profile_memory
+
+PARTS = (1, 2)
+
+def percentile(values:list[float], pct:float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+class PartResult:
+    """The answer and timings for one part of one day."""
+    def __init__(self, day:int, part:int, size:int):
+        self.day = day
+        self.part = part
+        self.size = size     # bytes of input
+        self.answer = None
+        self.expected = None # known answer, for generated inputs
+        self.times = []      # seconds per run
+        self.error = None
+        self.cached = False
+        self.memory = None   # MemoryProfile, when profiling
+        self.counts = None   # metrics of the last run, when counting
+
+    def check(self, expected):
+        """Flag the result as an error if it differs from a known answer."""
+        self.expected = expected
+        if self.error is None and expected is not None and self.answer != expected:
+            self.error = f"got {self.answer}, expected {expected}"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def throughput(self) -> float:
+        """Input megabytes processed per second (median run)."""
+        if not self.times or not self.median:
+            return 0.0
+        return self.size / self.median / 1e6
+
+    def row(self) -> str:
+        if self.error is not None:
+            return f"{self.day:>3}  {self.part:>4}  {'error: ' + self.error}"
+        if self.cached:
+            return f"{self.day:>3}  {self.part:>4}  {str(self.answer):<20.20}{'cached':>11}"
+        return (
+            f"{self.day:>3}  {self.part:>4}  {str(self.answer):<20.20}"
+            f"{min(self.times) * 1e3:>11.2f}"
+            f"{self.median * 1e3:>11.2f}"
+            f"{percentile(self.times, 95) * 1e3:>11.2f}"
+            f"{self.throughput:>10.3f}"
+        )
+
+HEADER = (
+    "Day  Part  Answer              "
+    "    min ms  median ms     p95 ms      MB/s"
+)
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("ran out of time")
+
+@contextlib.contextmanager
+def time_limit(seconds:float):
+    """Raise TimeoutError in the main thread if the block takes too long.
+    Limits need SIGALRM, so are ignored on platforms without it."""
+    if not seconds or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def time_part(
+    day:int, part:int, path:str,
+    repeat:int=1, timeout:float=None, memory:bool=False, counts:bool=False
+) -> PartResult:
+    """Run one part of a day repeatedly, recording the answer and timings.
+    With memory, one extra run is made to profile memory use. With counts,
+    the metrics reported by the last run are kept.
+    Anything the solution prints is discarded. timeout covers all runs."""
+    result = PartResult(day, part, os.path.getsize(path))
+    solve = getattr(load_day(day), f"solve_part{part}")
+    metrics.enable(counts)
+
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), \
+         time_limit(timeout):
+        for _ in range(repeat):
+            metrics.reset()
+            start = perf_counter()
+            try:
+                answer = solve(path)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+                break
+            result.times.append(perf_counter() - start)
+            if counts:
+                result.counts = metrics.snapshot()
+
+            if result.answer is not None and answer != result.answer:
+                result.error = f"answer changed between runs ({result.answer} -> {answer})"
+                break
+            result.answer = answer
+
+        metrics.enable(False)
+        if memory and result.error is None:
+            try:
+                _, result.memory = profile_memory(solve, path)
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+
+    return result
+
+def get_tasks(days:list[int], parts:list[int], inputs:str, input_path:str=None):
+    """Get (day, part, path) for every part to run, skipping missing inputs."""
+    tasks = []
+    for day in days:
+        path = input_path or os.path.join(inputs, f"input{day}.txt")
+        if not os.path.exists(path):
+            print(f"Skipping day {day}: no input at {path}")
+            continue
+
+        module = load_day(day)
+        for part in parts:
+            if hasattr(module, f"solve_part{part}"):
+                tasks.append((day, part, path))
+    return tasks
+
+def cached_result(cache:ResultCache, day:int, part:int, path:str) -> PartResult:
+    """Get a result from the cache, or None if the answer isn't stored."""
+    entry = cache.get(cache.key(day, part, path, source_paths(day)))
+    if entry is None:
+        return None
+
+    result = PartResult(day, part, os.path.getsize(path))
+    result.answer = entry["answer"]
+    result.cached = True
+    return result
+
+def run_tasks(
+    tasks, repeat:int=1, timeout:float=None, jobs:int=1,
+    cache:ResultCache=None, memory:bool=False, counts:bool=False
+):
+    """Yield the result of each (day, part, path) task, in order.
+    With more than one job the tasks are spread over a process pool, so the
+    total time is close to that of the slowest task. Answers found in the
+    cache are not recomputed, and new answers are added to it.
+    Profiling memory runs every task in a fresh process, so that the peak
+    RSS belongs to that task alone."""
+    pool = None
+    if memory:
+        pool = ProcessPoolExecutor(jobs or None, max_tasks_per_child=1)
+    elif jobs != 1:
+        pool = ProcessPoolExecutor(jobs or None)
+
+    pending = [] # (task, cached result or future or None)
+    for task in tasks:
+        hit = cache and cached_result(cache, *task)
+        if hit:
+            pending.append((task, hit))
+        elif pool:
+            pending.append((task, pool.submit(time_part, *task, repeat, timeout, memory, counts)))
+        else:
+            pending.append((task, None))
+
+    try:
+        for (day, part, path), item in pending:
+            if isinstance(item, PartResult):
+                yield item
+                continue
+
+            result = item.result() if pool else \
+                time_part(day, part, path, repeat, timeout, counts=counts)
+            if cache and result.error is None:
+                cache.put(cache.key(day, part, path, source_paths(day)), result.answer)
+            yield result
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run and time the daily solutions.")
+    parser.add_argument("days", nargs="*", type=int, default=list(DAYS),
+        help="days to run (default: all)")
+    parser.add_argument("-p", "--part", dest="parts", action="append", type=int,
+        choices=PARTS, help="part to run, may be repeated (default: both)")
+    parser.add_argument("-n", "--repeat", type=int, default=1,
+        help="number of timed runs per part")
+    parser.add_argument("-d", "--inputs", default=".",
+        help="directory containing inputN.txt files")
+    parser.add_argument("-i", "--input",
+        help="input file to use (only with a single day)")
+    parser.add_argument("-g", "--generate", type=int, metavar="SIZE",
+        help="run on generated inputs of this size and check the answers")
+    parser.add_argument("-s", "--seed", type=int, default=0,
+        help="seed for generated inputs")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+        help="worker processes to run parts in parallel (0: one per CPU)")
+    parser.add_argument("-t", "--timeout", type=float,
+        help="seconds allowed for each part (all repeats)")
+    parser.add_argument("--no-cache", action="store_true",
+        help="ignore cached answers and don't store new ones")
+    parser.add_argument("-m", "--memory", action="store_true",
+        help="profile peak memory and the top allocation sites of each part")
+    parser.add_argument("-c", "--counts", action="store_true",
+        help="report the work counted inside each part's loops")
+    parser.add_argument("--save-baseline", metavar="PATH",
+        help="store the timings (and memory, with -m) in a baseline file")
+    parser.add_argument("--compare", metavar="PATH",
+        help="flag parts that are slower or use more memory than a baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+        help="relative change ignored as noise when comparing (default: 0.1)")
+    args = parser.parse_args(argv)
+    args.parts = args.parts or list(PARTS)
+
+    if args.input and len(args.days) != 1:
+        parser.error("--input can only be used with a single day")
+    if args.input and args.generate:
+        parser.error("--input and --generate cannot be used together")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        expected = {}
+        if args.generate:
+            args.inputs = scratch
+            for day in args.days:
+                path = os.path.join(scratch, f"input{day}.txt")
+                answers = generators.write_input(day, args.generate, path, args.seed)
+                expected.update(((day, part), answer) for part, answer in answers.items())
+
+        start = perf_counter()
+        tasks = get_tasks(args.days, args.parts, args.inputs, args.input)
+
+        print(HEADER)
+        uncached = args.memory or args.counts or args.save_baseline or args.compare
+        cache = None if args.no_cache or uncached else ResultCache()
+        old = baseline.load(args.compare) if args.compare else {}
+        entries, regressions = [], 0
+        results = run_tasks(
+            tasks, args.repeat, args.timeout, args.jobs, cache, args.memory, args.counts
+        )
+        for (_, _, path), result in zip(tasks, results):
+            result.check(expected.get((result.day, result.part)))
+            print(result.row())
+            if (args.save_baseline or args.compare) and result.error is None and result.times:
+                label = baseline.input_label(path, args.generate, args.seed)
+                entries.append(baseline.record(result, label))
+                previous = old.get(baseline.entry_key(result.day, result.part, label))
+                if args.compare and previous is None:
+                    print(" " * 11 + "not in baseline")
+                elif previous:
+                    for regressed, change in baseline.compare(previous, entries[-1], args.threshold):
+                        regressions += regressed
+                        print(" " * 11 + ("REGRESSION " if regressed else "") + change)
+            if result.counts:
+                for name, count in sorted(result.counts.items()):
+                    print(" " * 11 + f"{name}: {count:,}")
+            if result.memory:
+                for line in result.memory.lines():
+                    print(" " * 11 + line)
+        print(f"Total wall time: {perf_counter() - start:.2f} s")
+
+    if args.compare:
+        print(f"{regressions} regression(s) against {args.compare}")
+    if args.save_baseline:
+        baseline.save(args.save_baseline, entries)
+        print(f"Saved {len(entries)} result(s) to {args.save_baseline}")
+
+if __name__ == "__main__":
+    main()